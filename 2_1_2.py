@@ -55,12 +55,20 @@ class DataSet:
     def csv_reader(file_name):
         file_csv = open(file_name, encoding='utf_8_sig')
         reader = csv.reader(file_csv)
-        list_data = [i for i in reader]
+        headings = next(reader, None)
 
-        if len(list_data) == 0:
+        if headings is None:
+            file_csv.close()
             print('Пустой файл')
             sys.exit()
-        return list_data[0], [i for i in list_data[1:] if '' not in i and len(i) == len(list_data[0])]
+        return headings, DataSet.read_rows(file_csv, reader, len(headings))
+
+    @staticmethod
+    def read_rows(file_csv, reader, length):
+        with file_csv:
+            for row in reader:
+                if '' not in row and len(row) == length:
+                    yield row
 
     @staticmethod
     def create_vacancies_objects(file_name):
@@ -75,8 +83,8 @@ class DataSet:
 
     @staticmethod
     def csv_filter(reader, list_naming):
-        return [{list_naming[i]: DataSet.process_vacancy(vacancy[i]) for i, v in enumerate(vacancy)} for vacancy in
-                reader]
+        return ({list_naming[i]: DataSet.process_vacancy(vacancy[i]) for i, v in enumerate(vacancy)} for vacancy in
+                reader)
 
     @staticmethod
     def process_vacancy(vacancy):
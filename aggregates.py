@@ -0,0 +1,220 @@
+import math
+from itertools import islice
+
+
+class PartialStatistics:
+    """
+    Класс для представления частичной статистики по вакансиям, которую можно объединять с другими частями
+
+    Каждая группа хранит список [количество вакансий, количество зарплат, суммы зарплат]. Суммы зарплат
+    хранятся списком сумм по частям и складываются через math.fsum, поэтому результат объединения
+    не зависит от порядка и группировки частей.
+
+    Attributes:
+        profession (str): Название профессии
+        vacancies_count (int): Общее количество вакансий
+        years (dict): Группы вакансий по годам
+        profession_years (dict): Группы вакансий с определенной профессией по годам
+        cities (dict): Группы вакансий по городам
+    """
+
+    def __init__(self, profession=''):
+        """
+        Инициализирует пустой объект PartialStatistics
+
+        Args:
+            profession (str): Название профессии
+        """
+        self.profession = profession
+        self.vacancies_count = 0
+        self.years = {}
+        self.profession_years = {}
+        self.cities = {}
+
+    def add(self, year, city, salary, is_profession):
+        """
+        Добавляет одну вакансию в статистику
+
+        Args:
+            year (int): Год публикации вакансии
+            city (str): Название города
+            salary (float | None): Средняя зарплата в рублях, None или NaN, если зарплата не указана
+            is_profession (bool): Подходит ли вакансия под профессию
+        """
+        self.vacancies_count += 1
+        PartialStatistics.add_salary(self.years, year, salary)
+        PartialStatistics.add_salary(self.cities, city, salary)
+        if is_profession:
+            PartialStatistics.add_salary(self.profession_years, year, salary)
+
+    @staticmethod
+    def add_salary(groups, key, salary):
+        """
+        Добавляет одну вакансию в группу
+
+        Args:
+            groups (dict): Группы, в которые добавляется вакансия
+            key (int | str): Год или город
+            salary (float | None): Средняя зарплата в рублях, None или NaN, если зарплата не указана
+        """
+        entry = groups.get(key)
+        if entry is None:
+            entry = groups[key] = [0, 0, [0]]
+        entry[0] += 1
+        if salary is not None and salary == salary:
+            entry[1] += 1
+            entry[2][-1] += salary
+
+    @staticmethod
+    def add_group(groups, key, count, salary_count, salary_sum):
+        """
+        Добавляет уже подсчитанную группу вакансий
+
+        Args:
+            groups (dict): Группы, в которые добавляются данные
+            key (int | str): Год или город
+            count (int): Количество вакансий
+            salary_count (int): Количество указанных зарплат
+            salary_sum (float): Сумма зарплат
+        """
+        entry = groups.get(key)
+        if entry is None:
+            groups[key] = [count, salary_count, [salary_sum]]
+        else:
+            entry[0] += count
+            entry[1] += salary_count
+            entry[2].append(salary_sum)
+
+    @staticmethod
+    def merge_groups(first, second):
+        """
+        Объединяет два словаря групп в новый словарь
+
+        Args:
+            first (dict): Первый словарь групп
+            second (dict): Второй словарь групп
+
+        Returns
+            dict: Объединенный словарь групп
+        """
+        groups = {key: [entry[0], entry[1], list(entry[2])] for key, entry in first.items()}
+        for key, entry in second.items():
+            if key in groups:
+                groups[key][0] += entry[0]
+                groups[key][1] += entry[1]
+                groups[key][2] += entry[2]
+            else:
+                groups[key] = [entry[0], entry[1], list(entry[2])]
+        return groups
+
+    def merge(self, other):
+        """
+        Объединяет статистику с другой частью статистики
+
+        Args:
+            other (PartialStatistics): Другая часть статистики
+
+        Returns
+            PartialStatistics: Новая объединенная статистика
+        """
+        merged = PartialStatistics(self.profession)
+        merged.vacancies_count = self.vacancies_count + other.vacancies_count
+        merged.years = PartialStatistics.merge_groups(self.years, other.years)
+        merged.profession_years = PartialStatistics.merge_groups(self.profession_years, other.profession_years)
+        merged.cities = PartialStatistics.merge_groups(self.cities, other.cities)
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def to_dict(self):
+        """
+        Переводит статистику в словарь из простых типов, например для сохранения в json
+
+        Returns
+            dict: Словарь со статистикой
+        """
+        return {'profession': self.profession,
+                'vacancies_count': self.vacancies_count,
+                'years': [[key] + entry for key, entry in self.years.items()],
+                'profession_years': [[key] + entry for key, entry in self.profession_years.items()],
+                'cities': [[key] + entry for key, entry in self.cities.items()]}
+
+    @staticmethod
+    def from_dict(data):
+        """
+        Создает статистику из словаря, полученного через to_dict
+
+        Args:
+            data (dict): Словарь со статистикой
+
+        Returns
+            PartialStatistics: Статистика
+        """
+        partial = PartialStatistics(data['profession'])
+        partial.vacancies_count = data['vacancies_count']
+        for name in ['years', 'profession_years', 'cities']:
+            setattr(partial, name, {key: [count, salary_count, list(sums)]
+                                    for key, count, salary_count, sums in data[name]})
+        return partial
+
+    @staticmethod
+    def get_average(entry):
+        """
+        Вычисляет среднюю зарплату группы
+
+        Args:
+            entry (list): Группа вакансий
+
+        Returns
+            int: Средняя зарплата, 0 если зарплаты не указаны
+        """
+        return int(math.fsum(entry[2]) / entry[1]) if entry[1] else 0
+
+    @staticmethod
+    def get_first_n_elems(d, n):
+        """
+        Сортирует словарь по убыванию значений и возвращает первые n элементов
+
+        Args:
+            d (dict): Словарь для обработки
+            n (int): Количество необходимых элементов
+
+        Return
+            dict: Отсортированный укороченный словарь
+        """
+        return dict(islice(sorted(d.items(), key=lambda v: v[1], reverse=True), n))
+
+    def get_cities(self):
+        """
+        Находит города, в которых не меньше 1% от общего количества вакансий
+
+        Returns
+            dict: Словарь, где каждому городу соответствует его группа вакансий
+        """
+        return {city: entry for city, entry in self.cities.items() if entry[0] / self.vacancies_count >= 0.01}
+
+    def finalize(self):
+        """
+        Вычисляет итоговые словари статистики
+
+        Returns
+            list: Список словарей: уровень зарплат и количество вакансий по годам, те же данные для профессии,
+            уровень зарплат по городам и доля вакансий по городам
+        """
+        salary_level = {year: PartialStatistics.get_average(entry) for year, entry in self.years.items()}
+        number_of_vacancies = {year: entry[0] for year, entry in self.years.items()}
+        if self.profession_years:
+            salary_level_by_profession = {year: PartialStatistics.get_average(entry)
+                                          for year, entry in self.profession_years.items()}
+            number_of_vacancies_by_profession = {year: entry[0] for year, entry in self.profession_years.items()}
+        else:
+            salary_level_by_profession = {year: 0 for year in self.years.keys()}
+            number_of_vacancies_by_profession = {year: 0 for year in self.years.keys()}
+        cities = self.get_cities()
+        salary_level_by_city = PartialStatistics.get_first_n_elems(
+            {city: PartialStatistics.get_average(entry) for city, entry in cities.items()}, 10)
+        share_of_vacancies = PartialStatistics.get_first_n_elems(
+            {city: round(entry[0] / self.vacancies_count, 4) for city, entry in cities.items()}, 10)
+        return [salary_level, number_of_vacancies, salary_level_by_profession, number_of_vacancies_by_profession,
+                salary_level_by_city, share_of_vacancies]
@@ -0,0 +1,60 @@
+import re
+from multiprocessing import Pool
+
+TAG_PATTERN = re.compile('<.*?>')
+
+
+def clean(value):
+    """
+    Очищает строку вакансии: удаляет html-теги, заменяет переводы строк на '; ' и схлопывает пробелы.
+    Регулярное выражение и замена выполняются, только если в строке есть '<' или перевод строки
+
+    Args:
+        value (str): Строка с данными о вакансии
+
+    Returns
+        str: Очищенная строка с данными о вакансии
+
+    >>> clean('Обязанности:</strong></p> <ul> <li>Работа с обращениями')
+    'Обязанности: Работа с обращениями'
+    >>> clean('Git\\nPython  3')
+    'Git; Python 3'
+    """
+    if '<' in value:
+        value = TAG_PATTERN.sub('', value)
+    if '\n' in value:
+        value = value.replace('\n', '; ')
+    return ' '.join(value.split())
+
+
+def clean_row(row):
+    """
+    Очищает все значения строки файла
+
+    Args:
+        row (list<str>): Строка файла
+
+    Returns
+        list<str>: Очищенные значения
+    """
+    return [clean(value) for value in row]
+
+
+def clean_rows(rows, processes=1, chunk_size=1000):
+    """
+    Очищает строки файла, при нескольких процессах распределяет строки между ними частями по chunk_size,
+    сохраняя порядок строк
+
+    Args:
+        rows (iterable<list>): Строки файла
+        processes (int): Количество процессов, 1 для очистки в текущем процессе, None для всех ядер
+        chunk_size (int): Количество строк, которые передаются процессу за раз
+
+    Returns
+        generator: Генератор очищенных строк
+    """
+    if processes == 1:
+        yield from map(clean_row, rows)
+        return
+    with Pool(processes) as pool:
+        yield from pool.imap(clean_row, rows, chunk_size)
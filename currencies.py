@@ -1,56 +1,245 @@
-import math
+import concurrent.futures
+import json
+import os
+import re
 import sqlite3
+import time
 
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from dateutil import rrule
 import xml.etree.ElementTree as ET
 from urllib.request import urlopen
-import divide_csv_file
+
+
+CBR_URL = 'http://www.cbr.ru/scripts'
+CACHE_DIR = 'cbr_cache'
+CURRENCY_IDS = {'USD': 'R01235', 'EUR': 'R01239', 'KZT': 'R01335', 'UAH': 'R01720', 'BYR': 'R01090'}
+columns = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
 
 
 def get_currency_dynamic(file_name):
     """
-    Получает dataframe из csv файла
+    Получает dataframe из csv файла, читая только столбцы, нужные для перевода зарплат в рубли
     :param file_name: название файла
     :return: dataframe с вакансиями
     """
     pd.set_option('expand_frame_repr', False)
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=columns)
     # df = df.dropna(subset=['salary_from', 'salary_to'], how='all')
     df['currency_count'] = df.groupby('salary_currency')['salary_currency'].transform('count')
     df = df[(df['currency_count'] > 5000) | (pd.isna(df['currency_count']))]
     return df
 
 
-def get_currency_dynamic_csv(file_name, dynamic_file_name):
+def fetch_url(url, retries=3, backoff=0.5):
+    """
+    Загружает содержимое по адресу, при ошибке повторяет запрос с экспоненциально растущей паузой
+    :param url: Адрес
+    :param retries: Количество попыток
+    :param backoff: Пауза перед второй попыткой в секундах, затем пауза удваивается
+    :return: Содержимое ответа
+    """
+    for attempt in range(retries):
+        try:
+            with urlopen(url, timeout=30) as response:
+                return response.read()
+        except OSError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def parse_daily_rates(content):
+    """
+    Разбирает xml с курсами валют на дату
+    :param content: Содержимое xml
+    :return: Словарь, где каждой валюте соответствует курс за одну единицу
+    """
+    root = ET.fromstring(content)
+    return {child.find('CharCode').text:
+            float(child.find('Value').text.replace(',', '.')) / float(child.find('Nominal').text)
+            for child in root.findall('Valute')}
+
+
+def fetch_daily_rates(date, base_url=CBR_URL, cache_dir=CACHE_DIR, retries=3, backoff=0.5):
+    """
+    Получает курсы валют на дату, разобранные курсы сохраняются на диск и при следующих запусках берутся оттуда
+    :param date: Дата
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Папка для кэша, None чтобы не использовать кэш
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :return: Словарь, где каждой валюте соответствует курс за одну единицу
+    """
+    cache_file = os.path.join(cache_dir, f'daily_{date.strftime("%Y-%m-%d")}.json') if cache_dir else None
+    if cache_file is not None and os.path.exists(cache_file):
+        with open(cache_file, encoding='utf-8') as file:
+            return json.load(file)
+
+    rates = parse_daily_rates(
+        fetch_url(f'{base_url}/XML_daily.asp?date_req={date.strftime("%d/%m/%Y")}', retries, backoff))
+    if cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_file + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(rates, file)
+        os.replace(cache_file + '.tmp', cache_file)
+    return rates
+
+
+def fetch_monthly_rates(dates, base_url=CBR_URL, cache_dir=CACHE_DIR, max_workers=8, retries=3, backoff=0.5):
+    """
+    Параллельно получает курсы валют на несколько дат, одновременно выполняется не больше max_workers запросов
+    :param dates: Даты
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Папка для кэша, None чтобы не использовать кэш
+    :param max_workers: Максимальное количество одновременных запросов
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :return: Список словарей курсов в порядке дат
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(lambda date: fetch_daily_rates(date, base_url, cache_dir, retries, backoff), dates))
+
+
+def parse_dynamic_rates(content):
+    """
+    Разбирает xml с динамикой курса одной валюты
+    :param content: Содержимое xml
+    :return: Список пар (дата, курс за одну единицу) в порядке дат
+    """
+    root = ET.fromstring(content)
+    return [(datetime.strptime(record.get('Date'), '%d.%m.%Y').date(),
+             float(record.find('Value').text.replace(',', '.')) / float(record.find('Nominal').text))
+            for record in root.findall('Record')]
+
+
+def fetch_dynamic_rates(currency_id, start_date, end_date, base_url=CBR_URL, retries=3, backoff=0.5):
+    """
+    Получает динамику курса валюты за период одним запросом
+    :param currency_id: Код валюты в справочнике ЦБ
+    :param start_date: Начало периода
+    :param end_date: Конец периода
+    :param base_url: Адрес сервиса курсов валют
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :return: Список пар (дата, курс за одну единицу) в порядке дат
+    """
+    return parse_dynamic_rates(fetch_url(f'{base_url}/XML_dynamic.asp?date_req1={start_date.strftime("%d/%m/%Y")}'
+                                         f'&date_req2={end_date.strftime("%d/%m/%Y")}&VAL_NM_RQ={currency_id}',
+                                         retries, backoff))
+
+
+def resample_monthly(records, dates):
+    """
+    Оставляет для каждой даты последний курс, установленный не позже этой даты в том же месяце
+    :param records: Пары (дата, курс) в порядке дат
+    :param dates: Даты, на которые нужны курсы
+    :return: Список курсов в порядке дат, None если в месяце до даты курса не было
+    """
+    rates = {}
+    for date, rate in records:
+        if date.day <= 28:
+            rates[date.strftime('%Y-%m')] = rate
+    return [rates.get(dt.strftime('%Y-%m')) for dt in dates]
+
+
+def fetch_monthly_rates_dynamic(dates, currencies, base_url=CBR_URL, max_workers=8, retries=3, backoff=0.5):
+    """
+    Получает курсы валют на несколько дат, запрашивая весь период одним запросом на каждую валюту.
+    Валюты, которых нет в CURRENCY_IDS, пропускаются
+    :param dates: Даты
+    :param currencies: Нужные валюты
+    :param base_url: Адрес сервиса курсов валют
+    :param max_workers: Максимальное количество одновременных запросов
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :return: Список словарей курсов в порядке дат
+    """
+    codes = [code for code in currencies if code in CURRENCY_IDS]
+    start_date, end_date = dates[0].replace(day=1), dates[-1]
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        columns = list(executor.map(
+            lambda code: resample_monthly(
+                fetch_dynamic_rates(CURRENCY_IDS[code], start_date, end_date, base_url, retries, backoff), dates),
+            codes))
+    return [{code: column[i] for code, column in zip(codes, columns) if column[i] is not None}
+            for i in range(len(dates))]
+
+
+def get_currency_dynamic_csv(file_name, dynamic_file_name, base_url=CBR_URL, cache_dir=CACHE_DIR, max_workers=8,
+                             retries=3, backoff=0.5, method='daily'):
     """
-    Создает csv файл с валютами
+    Создает csv файл с валютами. В режиме 'daily' запрашивает курсы всех валют на 28 число каждого месяца,
+    в режиме 'dynamic' запрашивает динамику каждой нужной валюты за весь период
     :param file_name: название файла с валютами
     :param dynamic_file_name: Название выходного файла с валютами
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Папка для кэша курсов, None чтобы не использовать кэш
+    :param max_workers: Максимальное количество одновременных запросов
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :param method: Режим загрузки курсов: 'daily' или 'dynamic'
     :return: csv файл с валютами
     """
     df = get_currency_dynamic(file_name)
     print(df['salary_currency'].value_counts())
     currencies = df['salary_currency'].unique()
     currencies = currencies[currencies != 'RUR']
+    dates = get_months(df)
+    monthly_rates = fetch_rates(dates, currencies, base_url, cache_dir, max_workers, retries, backoff, method)
+    get_currency_dataframe(dates, monthly_rates, currencies).to_csv(dynamic_file_name, index=False)
+
+
+def get_months(df):
+    """
+    Получает даты 28 числа каждого месяца от первой до последней публикации вакансий
+    :param df: dataframe с вакансиями
+    :return: Список дат
+    """
     start_date = datetime.strptime(df['published_at'].min(), '%Y-%m-%dT%H:%M:%S%z').replace(day=28, hour=12, minute=0,
                                                                                             second=0)
     end_date = datetime.strptime(df['published_at'].max(), '%Y-%m-%dT%H:%M:%S%z').replace(day=28, hour=12, minute=0,
                                                                                           second=0)
+    return list(rrule.rrule(rrule.MONTHLY, dtstart=start_date, until=end_date))
+
 
+def fetch_rates(dates, currencies, base_url=CBR_URL, cache_dir=CACHE_DIR, max_workers=8, retries=3, backoff=0.5,
+                method='daily'):
+    """
+    Получает курсы валют на даты выбранным способом
+    :param dates: Даты
+    :param currencies: Нужные валюты
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Папка для кэша курсов в режиме 'daily', None чтобы не использовать кэш
+    :param max_workers: Максимальное количество одновременных запросов
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :param method: Режим загрузки курсов: 'daily' или 'dynamic'
+    :return: Список словарей курсов в порядке дат
+    """
+    if method == 'dynamic':
+        return fetch_monthly_rates_dynamic(dates, currencies, base_url, max_workers, retries, backoff)
+    return fetch_monthly_rates(dates, base_url, cache_dir, max_workers, retries, backoff)
+
+
+def get_currency_dataframe(dates, monthly_rates, currencies):
+    """
+    Собирает dataframe с курсами нужных валют по месяцам. Месяцы, для которых нет ни одной нужной валюты,
+    пропускаются, отсутствующие курсы остаются пустыми
+    :param dates: Даты
+    :param monthly_rates: Словари курсов для каждой даты
+    :param currencies: Нужные валюты
+    :return: dataframe со столбцом date и столбцами валют
+    """
     currency_dynamic = {key: [] for key in currencies}
     currency_dynamic['date'] = []
-    for dt in rrule.rrule(rrule.MONTHLY, dtstart=start_date, until=end_date):
-        tree = ET.parse(
-            urlopen(f'http://www.cbr.ru/scripts/XML_daily.asp?date_req=28/{dt.strftime("%m/%Y")}d=1'))
-        root = tree.getroot()
-        for child in root.findall('Valute'):
-            code = child.find('CharCode').text
+    for dt, rates in zip(dates, monthly_rates):
+        for code, coeff in rates.items():
             if code in currencies:
                 if dt.strftime('%Y-%m') not in currency_dynamic['date']:
                     currency_dynamic['date'] += [dt.strftime('%Y-%m')]
-                coeff = float(child.find('Value').text.replace(',', '.')) / float(child.find('Nominal').text)
                 currency_dynamic[code] += [coeff]
         for key in currency_dynamic.keys():
             if key != 'date' and len(currency_dynamic['date']) > len(currency_dynamic[key]):
@@ -58,8 +247,118 @@ def get_currency_dynamic_csv(file_name, dynamic_file_name):
     currency_df = pd.DataFrame(data=currency_dynamic)
     cols = currency_df.columns.tolist()
     cols = cols[-1:] + cols[:-1]
-    currency_df = currency_df[cols]
-    currency_df.to_csv(dynamic_file_name, index=False)
+    return currency_df[cols]
+
+
+def get_rate_matrix(dynamic_file_name):
+    """
+    Один раз загружает курсы валют в матрицу месяц × валюта
+    :param dynamic_file_name: Название файла с курсами валют
+    :return: Индекс месяцев, индекс валют и матрица курсов
+    """
+    rates = pd.read_csv(dynamic_file_name, index_col='date')
+    return rates.index, rates.columns, rates.to_numpy(dtype=float)
+
+
+def get_rate_matrix_sqlite(conn):
+    """
+    Загружает курсы валют из таблицы currency_dynamic в матрицу месяц × валюта
+    :param conn: Соединение с базой, в которой есть таблица currency_dynamic
+    :return: Индекс месяцев, индекс валют и матрица курсов
+    """
+    rates = pd.read_sql('SELECT * FROM currency_dynamic', conn, index_col='date')
+    return rates.index, rates.columns, rates.to_numpy(dtype=float)
+
+
+def get_stored_rates(c, currencies):
+    """
+    Находит пары (месяц, валюта), которые уже есть в базе курсов: курс записан в currency_dynamic или
+    курс уже запрашивался и его не оказалось, что отмечено в currency_dynamic_fetched
+    :param c: Курсор базы курсов
+    :param currencies: Нужные валюты
+    :return: Множество пар (месяц, валюта)
+    """
+    tables = {row[0] for row in c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    stored = set()
+    if 'currency_dynamic' in tables:
+        columns = [column[1] for column in c.execute('PRAGMA table_info(currency_dynamic)')]
+        for code in currencies:
+            if code in columns:
+                stored.update((row[0], code) for row in
+                              c.execute(f'SELECT date FROM currency_dynamic WHERE "{code}" IS NOT NULL'))
+    if 'currency_dynamic_fetched' in tables:
+        stored.update(c.execute('SELECT date, currency FROM currency_dynamic_fetched'))
+    return stored
+
+
+def update_currency_dynamic_sqlite(conn, df, base_url=CBR_URL, cache_dir=CACHE_DIR, max_workers=8, retries=3,
+                                   backoff=0.5, method='daily'):
+    """
+    Дополняет таблицу currency_dynamic курсами нужных валют за месяцы публикации вакансий, которых в ней еще нет.
+    Недостающие курсы определяются для каждой пары (месяц, валюта), поэтому файлы с разным набором валют
+    дополняют одну и ту же базу. Если все курсы уже есть, запросов к сервису и записи в базу не происходит
+    :param conn: Соединение с базой курсов
+    :param df: dataframe с вакансиями
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Папка для кэша курсов в режиме 'daily', None чтобы не использовать кэш
+    :param max_workers: Максимальное количество одновременных запросов
+    :param retries: Количество попыток запроса
+    :param backoff: Пауза перед повторным запросом в секундах
+    :param method: Режим загрузки курсов: 'daily' или 'dynamic'
+    :return: Количество запрошенных месяцев
+    """
+    c = conn.cursor()
+    currencies = [code for code in df['salary_currency'].dropna().unique()
+                  if code != 'RUR' and re.fullmatch('[A-Z]{3}', code)]
+    stored = get_stored_rates(c, currencies)
+    missing = [dt for dt in get_months(df)
+               if any((dt.strftime('%Y-%m'), code) not in stored for code in currencies)]
+    if not missing:
+        return 0
+
+    monthly_rates = fetch_rates(missing, currencies, base_url, cache_dir, max_workers, retries, backoff, method)
+    with conn:
+        c.execute('CREATE TABLE IF NOT EXISTS currency_dynamic (date TEXT)')
+        stored_columns = [column[1] for column in c.execute('PRAGMA table_info(currency_dynamic)')]
+        columns = [column for column in stored_columns if re.fullmatch('[A-Z]{3}', column)]
+        if method == 'dynamic':
+            columns = [code for code in columns if code in currencies]
+        columns += [code for code in currencies if code not in columns]
+        for code in columns:
+            if code not in stored_columns:
+                c.execute(f'ALTER TABLE currency_dynamic ADD COLUMN "{code}" REAL')
+        c.execute('CREATE UNIQUE INDEX IF NOT EXISTS currency_dynamic_date ON currency_dynamic (date)')
+        c.execute('CREATE TABLE IF NOT EXISTS currency_dynamic_fetched (date TEXT, currency TEXT, '
+                  'PRIMARY KEY (date, currency))')
+        names = ', '.join(f'"{code}"' for code in columns)
+        updates = ', '.join(f'"{code}" = COALESCE(excluded."{code}", "{code}")' for code in columns)
+        c.executemany(f'INSERT INTO currency_dynamic (date, {names}) VALUES ({", ".join("?" * (len(columns) + 1))}) '
+                      f'ON CONFLICT (date) DO UPDATE SET {updates}',
+                      [[dt.strftime('%Y-%m')] + [rates.get(code) for code in columns]
+                       for dt, rates in zip(missing, monthly_rates)])
+        c.executemany('INSERT OR IGNORE INTO currency_dynamic_fetched VALUES (?, ?)',
+                      [(dt.strftime('%Y-%m'), code) for dt in missing for code in columns])
+    print(f'Обновлено месяцев в базе курсов: {len(missing)}')
+    return len(missing)
+
+
+def convert_to_rub(df, months, currencies, matrix):
+    """
+    Переводит зарплаты к рублям для всех строк сразу: курс берется из матрицы по месяцу публикации и валюте.
+    Зарплата без валюты, с неизвестным курсом или курсом NaN становится NaN, рубли не переводятся
+    :param df: dataframe с вакансиями и средней зарплатой в столбце salary
+    :param months: Индекс месяцев матрицы
+    :param currencies: Индекс валют матрицы
+    :param matrix: Матрица курсов
+    :return: Series с переведенными зарплатами
+    """
+    month_ids = months.get_indexer(df['published_at'].str[:7])
+    currency_ids = currencies.get_indexer(df['salary_currency'])
+    found = (month_ids >= 0) & (currency_ids >= 0)
+    rates = np.full(len(df.index), np.nan)
+    rates[found] = matrix[month_ids[found], currency_ids[found]]
+    rates[(df['salary_currency'] == 'RUR').to_numpy()] = 1
+    return df['salary'] * rates
 
 
 def convert_salary_to_rub(file_name):
@@ -68,69 +367,57 @@ def convert_salary_to_rub(file_name):
     :param file_name: Название входного файла
     :return: dataframe c переведенными валютами
     """
-    def convert_to_rub(row):
-        """
-        Переводит зарплату к рублям
-        :param row: Строка вакансии
-        :return: Переведенную зарплату
-        """
-        if pd.isna(row['salary_currency']):
-            return None
-        if row['salary_currency'] != 'RUR':
-            date = datetime.strptime(row['published_at'], '%Y-%m-%dT%H:%M:%S%z')
-            df = pd.read_csv(f'csv_files/year_{date.year}.csv')
-            convert_value = df[df['date'] == date.strftime('%Y-%m')][row['salary_currency']].values[0]
-            return None if math.isnan(convert_value) else row['salary'] * convert_value
-        return row['salary']
-
-    def count_salary(row):
-        """
-        Считает среднюю зарплату
-        :param row: Строка в вакансией
-        :return: Среднюю зарплату
-        """
-        if math.isnan(row['salary_from']):
-            return row['salary_to']
-        elif math.isnan(row['salary_to']):
-            return row['salary_from']
-        elif math.isnan(row['salary_from']) and math.isnan(row['salary_to']):
-            return None
-        return (row['salary_from'] + row['salary_to']) / 2
-
-    dynamic_file_name = 'currency_dynamic.csv'
     df = get_currency_dynamic(file_name)
     # print(df.head(10))
-    get_currency_dynamic_csv(file_name, dynamic_file_name)
-    divide_csv_file.divide_currency_file_by_year(dynamic_file_name)
+    conn = sqlite3.connect('currency_dynamic.sqlite3')
+    update_currency_dynamic_sqlite(conn, df)
+    rate_matrix = get_rate_matrix_sqlite(conn)
+    conn.close()
     # df = df.head(100)
-    df['salary'] = df.apply(count_salary, axis=1)
-    df['salary'] = df.apply(convert_to_rub, axis=1)
+    df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
+    df['salary'] = convert_to_rub(df, *rate_matrix)
     df.head(100).loc[:, ['name', 'salary', 'area_name', 'published_at']].to_csv('salary_info.csv', index=False)
     return df.loc[:, ['name', 'salary', 'area_name', 'published_at']]
 
-def convert_salary_to_rub_sqlite(file_name):
-    def convert_to_rub(row):
-        if row['salary_currency'] != 'RUR':
-            date = datetime.strptime(row['published_at'], '%Y-%m-%dT%H:%M:%S%z').strftime('%Y-%m')
-            convert_value = c.execute(f"SELECT {row['salary_currency']} FROM currency_dynamic WHERE date = '{date}'").fetchone()[0]
-            return None if not convert_value else row['salary'] * convert_value
-        return row['salary']
-
-    def count_salary(row):
-        if math.isnan(row['salary_from']):
-            return row['salary_to']
-        elif math.isnan(row['salary_to']):
-            return row['salary_from']
-        return (row['salary_from'] + row['salary_to']) / 2
 
-    conn = sqlite3.connect('currency_dynamic.sqlite3')
+def convert_to_rub_sqlite(conn, df):
+    """
+    Переводит зарплаты к рублям одним запросом: вакансии загружаются во временную таблицу, которая соединяется
+    с таблицей курсов по месяцу. Валюта выбирается через CASE только среди столбцов таблицы курсов
+    :param conn: Соединение с базой, в которой есть таблица currency_dynamic
+    :param df: dataframe с вакансиями и средней зарплатой в столбце salary
+    :return: Series с переведенными зарплатами
+    """
+    start = time.perf_counter()
     c = conn.cursor()
+    rate_columns = [column[1] for column in c.execute('PRAGMA table_info(currency_dynamic)')
+                    if re.fullmatch('[A-Z]{3}', column[1])]
+    c.execute('CREATE TEMP TABLE IF NOT EXISTS salary_staging (id INTEGER PRIMARY KEY, salary REAL, currency TEXT, '
+              'month TEXT)')
+    c.execute('DELETE FROM salary_staging')
+    c.executemany('INSERT INTO salary_staging VALUES (?, ?, ?, ?)',
+                  zip(range(len(df.index)), df['salary'].astype(float).where(df['salary'].notna(), None),
+                      df['salary_currency'].where(df['salary_currency'].notna(), None),
+                      df['published_at'].str[:7]))
+    cases = ' '.join(f"WHEN '{column}' THEN s.salary * NULLIF(c.\"{column}\", 0)" for column in rate_columns)
+    salaries = [row[0] for row in c.execute(
+        f"SELECT CASE s.currency WHEN 'RUR' THEN s.salary {cases} END FROM salary_staging s "
+        'LEFT JOIN currency_dynamic c ON c.date = s.month ORDER BY s.id')]
+    c.execute('DROP TABLE salary_staging')
+    elapsed = time.perf_counter() - start
+    print(f'Переведено зарплат: {len(salaries)}, {len(salaries) / elapsed:.0f} строк в секунду')
+    return pd.Series(salaries, index=df.index, dtype=float)
+
+
+def convert_salary_to_rub_sqlite(file_name):
+    conn = sqlite3.connect('currency_dynamic.sqlite3')
     df = get_currency_dynamic(file_name)
+    update_currency_dynamic_sqlite(conn, df)
     # df = df.head(100)
-    df['salary'] = df.apply(count_salary, axis=1)
-    df['salary'] = df.apply(convert_to_rub, axis=1)
-    df = df[df['salary'] != 'NaN']
-    df['published_at'] = df.apply(lambda row: datetime.strptime(row['published_at'], '%Y-%m-%dT%H:%M:%S%z').strftime('%Y-%m-%d'), axis = 1)
+    df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
+    df['salary'] = convert_to_rub_sqlite(conn, df)
+    conn.close()
+    df['published_at'] = df['published_at'].str[:10]
     conn = sqlite3.connect('salary_info.sqlite3')
     c = conn.cursor()
     c.execute(
@@ -140,4 +427,3 @@ def convert_salary_to_rub_sqlite(file_name):
     df.loc[:, ['name', 'salary', 'area_name', 'published_at']].to_sql('salary_info', conn, if_exists='replace', index=False)
     c.execute('SELECT * FROM salary_info')
     conn.close()
-
@@ -29,4 +29,5 @@ def divide_currency_file_by_year(file_name):
     return years
 
 
-divide_currency_file_by_year('currency_dynamic.csv')
\ No newline at end of file
+if __name__ == '__main__':
+    divide_currency_file_by_year('currency_dynamic.csv')
\ No newline at end of file
@@ -0,0 +1,95 @@
+import pickle
+import tempfile
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+
+
+def write_run(pairs, directory=None):
+    """
+    Записывает отсортированную серию пар (ключ, элемент) во временный файл
+
+    Args:
+        pairs (iterable<tuple>): Пары (ключ, элемент) в порядке сортировки
+        directory (str): Папка для временных файлов, None для системной папки
+
+    Returns
+        file: Временный файл с серией, открытый на начале
+    """
+    file = tempfile.TemporaryFile(dir=directory)
+    for pair in pairs:
+        pickle.dump(pair, file, pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def read_run(file):
+    """
+    Построчно читает серию из временного файла и закрывает его после чтения
+
+    Args:
+        file (file): Временный файл с серией
+
+    Returns
+        generator: Генератор пар (ключ, элемент)
+    """
+    with file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def merge_runs(runs, reverse=False):
+    """
+    Сливает отсортированные серии в одну, при равных ключах раньше идут элементы из более ранних серий
+
+    Args:
+        runs (list): Генераторы отсортированных пар (ключ, элемент)
+        reverse (bool): Отсортированы ли серии по убыванию
+
+    Returns
+        iterator: Пары (ключ, элемент) в порядке сортировки
+    """
+    return merge(*runs, key=itemgetter(0), reverse=reverse)
+
+
+def external_sort(items, key, reverse=False, chunk_size=100000, max_runs=64, directory=None):
+    """
+    Сортирует элементы внешней сортировкой слиянием: части по chunk_size элементов сортируются в памяти
+    и сохраняются во временные файлы, затем серии сливаются. Сортировка устойчивая, результат совпадает
+    с sorted(items, key=key, reverse=reverse)
+
+    Args:
+        items (iterable): Элементы для сортировки
+        key (function): Функция для получения ключа сортировки
+        reverse (bool): Сортировать ли по убыванию
+        chunk_size (int): Максимальное количество элементов, которые сортируются в памяти
+        max_runs (int): Максимальное количество серий, которые сливаются за один раз
+        directory (str): Папка для временных файлов, None для системной папки
+
+    Returns
+        generator: Отсортированные элементы
+
+    >>> list(external_sort([5, 3, 8, 1, 9, 2, 7], key=lambda x: x % 3, chunk_size=2, max_runs=2))
+    [3, 9, 1, 7, 5, 8, 2]
+    """
+    items = iter(items)
+    runs = []
+    while True:
+        chunk = [(key(item), item) for item in islice(items, chunk_size)]
+        if not chunk:
+            break
+        chunk.sort(key=itemgetter(0), reverse=reverse)
+        if not runs and len(chunk) < chunk_size:
+            yield from (item for _, item in chunk)
+            return
+        runs.append(write_run(chunk, directory))
+        del chunk
+
+    while len(runs) > max_runs:
+        runs = [write_run(merge_runs([read_run(run) for run in runs[i:i + max_runs]], reverse), directory)
+                for i in range(0, len(runs), max_runs)]
+    for _, item in merge_runs([read_run(run) for run in runs], reverse):
+        yield item
@@ -0,0 +1,212 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class IntervalTree:
+    """
+    Класс для представления дерева отрезков с центрами, которое находит отрезки, содержащие точку или
+    пересекающиеся с отрезком
+
+    Attributes:
+        root (list): Корневой узел дерева [центр, отрезки по возрастанию начала, отрезки по убыванию конца,
+            левое поддерево, правое поддерево]
+        size (int): Количество отрезков в дереве
+        starts (list): Начала отрезков по возрастанию
+        ends (list): Концы отрезков по возрастанию
+    """
+
+    def __init__(self, intervals):
+        """
+        Инициализирует объект IntervalTree, строит дерево по списку отрезков
+
+        Args:
+            intervals (iterable<tuple>): Отрезки (начало, конец, номер строки), пустые отрезки пропускаются
+        """
+        intervals = [interval for interval in intervals if interval[0] <= interval[1]]
+        self.size = len(intervals)
+        self.starts = sorted(interval[0] for interval in intervals)
+        self.ends = sorted(interval[1] for interval in intervals)
+        self.root = IntervalTree.build(intervals)
+
+    @staticmethod
+    def build(intervals):
+        """
+        Строит узел дерева: отрезки, содержащие центр, хранятся в узле, остальные уходят в поддеревья
+
+        Args:
+            intervals (list<tuple>): Отрезки (начало, конец, номер строки)
+
+        Returns
+            list: Узел дерева, None для пустого списка
+        """
+        if not intervals:
+            return None
+        points = sorted(point for interval in intervals for point in interval[:2])
+        center = points[len(points) // 2]
+        left = [interval for interval in intervals if interval[1] < center]
+        right = [interval for interval in intervals if interval[0] > center]
+        middle = [interval for interval in intervals if interval[0] <= center <= interval[1]]
+        return [center,
+                sorted(middle, key=lambda interval: interval[0]),
+                sorted(middle, key=lambda interval: interval[1], reverse=True),
+                IntervalTree.build(left),
+                IntervalTree.build(right)]
+
+    def stab(self, point):
+        """
+        Находит отрезки, содержащие точку
+
+        Args:
+            point (int): Точка
+
+        Returns
+            list: Номера строк подходящих отрезков по возрастанию
+
+        >>> IntervalTree([(10, 20, 0), (15, 30, 1), (25, 40, 2), (50, 10, 3)]).stab(18)
+        [0, 1]
+        """
+        return self.overlap(point, point)
+
+    def overlap(self, start, end):
+        """
+        Находит отрезки, пересекающиеся с отрезком [start, end]
+
+        Args:
+            start (int): Начало отрезка
+            end (int): Конец отрезка
+
+        Returns
+            list: Номера строк подходящих отрезков по возрастанию
+
+        >>> IntervalTree([(10, 20, 0), (15, 30, 1), (25, 40, 2)]).overlap(21, 26)
+        [1, 2]
+        """
+        found = []
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+            if end < center:
+                for interval in by_start:
+                    if interval[0] > end:
+                        break
+                    found.append(interval[2])
+                nodes.append(left)
+            elif start > center:
+                for interval in by_end:
+                    if interval[1] < start:
+                        break
+                    found.append(interval[2])
+                nodes.append(right)
+            else:
+                found.extend(interval[2] for interval in by_start)
+                nodes.append(left)
+                nodes.append(right)
+        return sorted(found)
+
+    def count(self, start, end):
+        """
+        Подсчитывает бинарным поиском количество отрезков, пересекающихся с отрезком [start, end], не обходя дерево
+
+        Args:
+            start (int): Начало отрезка
+            end (int): Конец отрезка
+
+        Returns
+            int: Количество подходящих отрезков
+
+        >>> IntervalTree([(10, 20, 0), (15, 30, 1), (25, 40, 2)]).count(21, 26)
+        2
+        """
+        return self.size - (len(self.starts) - bisect_right(self.starts, end)) - bisect_left(self.ends, start)
+
+
+class SkillsIndex:
+    """
+    Класс для инвертированного индекса навыков
+
+    Attributes:
+        postings (dict): Словарь, где каждому навыку соответствует массив номеров строк по возрастанию
+    """
+
+    def __init__(self):
+        """
+        Инициализирует пустой объект SkillsIndex
+        """
+        self.postings = {}
+
+    def add(self, row_id, skills):
+        """
+        Добавляет навыки строки в индекс. Строки должны добавляться по возрастанию номеров
+
+        Args:
+            row_id (int): Номер строки
+            skills (iterable<str>): Навыки
+        """
+        for skill in set(skills):
+            posting = self.postings.get(skill)
+            if posting is None:
+                posting = self.postings[skill] = array('I')
+            posting.append(row_id)
+
+    def find_all(self, skills):
+        """
+        Находит строки, в которых есть все навыки, пересечением списков строк начиная с самого короткого
+
+        Args:
+            skills (iterable<str>): Навыки
+
+        Returns
+            list: Номера подходящих строк по возрастанию
+
+        >>> index = SkillsIndex()
+        >>> for row_id, skills in enumerate([['Git', 'Python'], ['Git'], ['Python', 'SQL', 'Git']]):
+        ...     index.add(row_id, skills)
+        >>> index.find_all(['Python', 'Git'])
+        [0, 2]
+        """
+        postings = [self.postings.get(skill) for skill in set(skills)]
+        if not postings or None in postings:
+            return []
+        postings.sort(key=len)
+        found = list(postings[0])
+        for posting in postings[1:]:
+            found = [row_id for row_id in found if SkillsIndex.contains(posting, row_id)]
+            if not found:
+                break
+        return found
+
+    @staticmethod
+    def contains(posting, row_id):
+        """
+        Проверяет бинарным поиском, есть ли строка в списке строк навыка
+
+        Args:
+            posting (array): Номера строк по возрастанию
+            row_id (int): Номер строки
+
+        Returns
+            bool: Есть ли строка в списке
+        """
+        position = bisect_left(posting, row_id)
+        return position < len(posting) and posting[position] == row_id
+
+    def count_by_year(self, years):
+        """
+        Подсчитывает, сколько раз встречается каждый навык в каждом году
+
+        Args:
+            years (list<int>): Годы публикации для каждой строки
+
+        Returns
+            dict: Словарь, где каждому году соответствует словарь навыков с количеством по убыванию
+        """
+        counts = {}
+        for skill, posting in self.postings.items():
+            for row_id in posting:
+                year_counts = counts.setdefault(years[row_id], {})
+                year_counts[skill] = year_counts.get(skill, 0) + 1
+        return {year: dict(sorted(year_counts.items(), key=lambda v: v[1], reverse=True))
+                for year, year_counts in sorted(counts.items())}
@@ -0,0 +1,191 @@
+import csv
+import io
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from pdf import DataSet, Statistics, Vacancy, VacancyColumns
+from aggregates import PartialStatistics
+
+
+def find_record_end(data, position, quotes=0):
+    """
+    Находит конец записи csv, начиная с позиции: первый перевод строки, перед которым четное количество кавычек,
+    то есть перевод строки не внутри поля в кавычках
+
+    Args:
+        data (mmap): Содержимое файла
+        position (int): Позиция, с которой начинается поиск
+        quotes (int): Количество кавычек от начала записи до позиции
+
+    Returns
+        int: Позиция начала следующей записи
+
+    >>> find_record_end(b'a,"b\\nc"\\nd,e\\n', 0)
+    8
+    """
+    while True:
+        end = data.find(b'\n', position)
+        if end == -1:
+            return len(data)
+        quotes += data[position:end].count(b'"')
+        position = end + 1
+        if quotes % 2 == 0:
+            return position
+
+
+def split_file(file_name, chunks):
+    """
+    Делит файл на части по границам записей csv, учитывая многострочные поля в кавычках. Первая запись с
+    заголовками в части не входит
+
+    Args:
+        file_name (str): Название файла
+        chunks (int): Желаемое количество частей
+
+    Returns
+        list<tuple>: Начало и конец каждой части в байтах
+    """
+    with open(file_name, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = position = find_record_end(data, 0)
+            bounds = []
+            for i in range(1, chunks + 1):
+                if position >= len(data):
+                    break
+                target = max(position, start + (len(data) - start) * i // chunks)
+                end = find_record_end(data, target, data[position:target].count(b'"'))
+                bounds.append((position, end))
+                position = end
+            return bounds
+
+
+def read_chunk(file_name, start, end, headings):
+    """
+    Читает и очищает вакансии из части файла
+
+    Args:
+        file_name (str): Название файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+        headings (list): Заголовки файла
+
+    Returns
+        generator: Генератор словарей вакансий
+    """
+    with open(file_name, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode('utf-8')
+    buffer = io.StringIO(text, newline=None)
+    rows = DataSet.read_rows(buffer, csv.reader(buffer), len(headings))
+    return DataSet.csv_filter(rows, headings, Vacancy.columns)
+
+
+def read_columns(file_name, start, end, headings):
+    """
+    Читает часть файла в столбцы
+
+    Args:
+        file_name (str): Название файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+        headings (list): Заголовки файла
+
+    Returns
+        VacancyColumns: Вакансии части по столбцам
+    """
+    return VacancyColumns.from_vacancies(read_chunk(file_name, start, end, headings))
+
+
+def read_statistics(file_name, start, end, headings, profession):
+    """
+    Подсчитывает частичную статистику по части файла
+
+    Args:
+        file_name (str): Название файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+        headings (list): Заголовки файла
+        profession (str): Название профессии
+
+    Returns
+        PartialStatistics: Статистика по части файла
+    """
+    return Statistics.collect_columns(read_columns(file_name, start, end, headings), profession)
+
+
+def read_headings(file_name):
+    """
+    Считывает заголовки файла
+
+    Args:
+        file_name (str): Название файла
+
+    Returns
+        list: Заголовки файла
+    """
+    with open(file_name, encoding='utf_8_sig') as file_csv:
+        headings = next(csv.reader(file_csv), None)
+    if headings is None:
+        print('Пустой файл')
+        sys.exit()
+    return headings
+
+
+def map_chunks(function, file_name, processes=None, chunks=None, *args):
+    """
+    Делит файл на части и обрабатывает их в пуле процессов
+
+    Args:
+        function (function): Функция обработки части
+        file_name (str): Название файла
+        processes (int): Количество процессов, None для всех ядер
+        chunks (int): Количество частей, None для четырех частей на процесс
+        args: Дополнительные аргументы функции
+
+    Returns
+        list: Результаты обработки частей в порядке частей файла
+    """
+    headings = read_headings(file_name)
+    processes = processes or os.cpu_count()
+    bounds = split_file(file_name, chunks or processes * 4)
+    with ProcessPoolExecutor(processes) as executor:
+        futures = [executor.submit(function, file_name, start, end, headings, *args) for start, end in bounds]
+        return [future.result() for future in futures]
+
+
+def load_columns(file_name, processes=None, chunks=None):
+    """
+    Параллельно читает файл в столбцы
+
+    Args:
+        file_name (str): Название файла
+        processes (int): Количество процессов, None для всех ядер
+        chunks (int): Количество частей, None для четырех частей на процесс
+
+    Returns
+        VacancyColumns: Вакансии по столбцам в порядке файла
+    """
+    columns = VacancyColumns()
+    for part in map_chunks(read_columns, file_name, processes, chunks):
+        columns.extend(part)
+    return columns
+
+
+def load_statistics(file_name, profession, processes=None, chunks=None):
+    """
+    Параллельно подсчитывает статистику по файлу
+
+    Args:
+        file_name (str): Название файла
+        profession (str): Название профессии
+        processes (int): Количество процессов, None для всех ядер
+        chunks (int): Количество частей, None для четырех частей на процесс
+
+    Returns
+        PartialStatistics: Статистика по всему файлу
+    """
+    return reduce(PartialStatistics.merge, map_chunks(read_statistics, file_name, processes, chunks, profession),
+                  PartialStatistics(profession))
@@ -1,7 +1,6 @@
 import csv
-import re
-from datetime import datetime
-from collections import Counter
+from array import array
+from functools import wraps
 import sys
 from itertools import islice
 from openpyxl import Workbook
@@ -10,6 +9,27 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pdfkit
 from jinja2 import Environment, FileSystemLoader
+from aggregates import PartialStatistics
+from text_search import AhoCorasick, TrigramIndex
+from cleaning import clean
+
+
+def memoize(method):
+    """
+    Запоминает результат метода без аргументов в словаре results объекта
+
+    Args:
+        method (function): Метод для кэширования
+
+    Returns
+        function: Метод, который вычисляет результат только при первом вызове
+    """
+    @wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self.results:
+            self.results[method.__name__] = method(self)
+        return self.results[method.__name__]
+    return wrapper
 
 
 class Salary:
@@ -17,23 +37,25 @@ class Salary:
     Класс для представления зарплаты
 
     Attributes:
-        salary_from (int): Нижняя граница оклада
-        salary_to (int): Верхняя граница оклада
+        salary_from (float): Нижняя граница оклада
+        salary_to (float): Верхняя граница оклада
         salary_currency (str): Валюта оклада
+        average_salary_rub (float): Средняя зарплата в рублях
     """
 
     def __init__(self, salary_from, salary_to, salary_currency):
         """
-        Инициализирует объект Salary
+        Инициализирует объект Salary, один раз переводит границы оклада в числа и вычисляет среднюю зарплату в рублях
 
         Args:
-            salary_from (str): Нижняя граница оклада
-            salary_to (str): Верхняя граница оклада
+            salary_from (str | float): Нижняя граница оклада
+            salary_to (str | float): Верхняя граница оклада
             salary_currency (str): Валюта оклада
         """
-        self.salary_from = salary_from
-        self.salary_to = salary_to
+        self.salary_from = float(salary_from)
+        self.salary_to = float(salary_to)
         self.salary_currency = salary_currency
+        self.average_salary_rub = ((self.salary_from + self.salary_to) / 2) * self.currency_to_rub[salary_currency]
 
     currency_to_rub = {
         "AZN": 35.68,
@@ -55,8 +77,7 @@ class Salary:
         Returns:
             float: Средняя зарплата в рублях
         """
-        return ((float(self.salary_from) + float(self.salary_to)) / 2) * self.currency_to_rub[
-            self.salary_currency]
+        return self.average_salary_rub
 
 
 class Vacancy:
@@ -66,25 +87,27 @@ class Vacancy:
     Attributes:
         name (str): Название вакансии
         area_name (str): Название города
-        salary (str): Информация о зарплате
+        salary (Salary): Информация о зарплате
         published_at (str): Время и дата публикации вакансии
+        year (int): Год публикации вакансии
     """
 
     def __init__(self, name, area_name, salary,
                  published_at):
         """
-        Инициализирует объект Vacancy
+        Инициализирует объект Vacancy, один раз определяет год публикации вакансии
 
         Args:
             name (str): Название вакансии
             area_name (str): Название города
-            salary (str): Информация о зарплате
+            salary (Salary): Информация о зарплате
             published_at (str): Время и дата публикации вакансии
         """
         self.name = name
         self.salary = salary
         self.area_name = area_name
         self.published_at = published_at
+        self.year = int(published_at[:4])
 
     def get_year(self):
         """
@@ -93,7 +116,140 @@ class Vacancy:
         Returns
             int: Год публикации вакансии
         """
-        return int(datetime.strptime(self.published_at, '%Y-%m-%dT%H:%M:%S%z').strftime('%Y'))
+        return self.year
+
+    columns = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+
+class VacancyColumns:
+    """
+    Класс для компактного хранения вакансий по столбцам
+
+    Attributes:
+        names (list): Уникальные названия вакансий
+        areas (list): Уникальные названия городов
+        currencies (list): Уникальные валюты оклада
+        name_ids (array): Номера названий вакансий в names
+        area_ids (array): Номера городов в areas
+        currency_ids (array): Номера валют в currencies
+        salary_from (array): Нижние границы оклада
+        salary_to (array): Верхние границы оклада
+        year (array): Годы публикации вакансий
+        month (array): Месяцы публикации вакансий
+    """
+
+    def __init__(self):
+        """
+        Инициализирует пустой объект VacancyColumns
+        """
+        self.names = []
+        self.areas = []
+        self.currencies = []
+        self.name_codes = {}
+        self.area_codes = {}
+        self.currency_codes = {}
+        self.name_ids = array('I')
+        self.area_ids = array('I')
+        self.currency_ids = array('B')
+        self.salary_from = array('d')
+        self.salary_to = array('d')
+        self.year = array('H')
+        self.month = array('B')
+
+    def __len__(self):
+        """
+        Возвращает количество вакансий
+
+        Returns
+            int: Количество вакансий
+        """
+        return len(self.year)
+
+    @staticmethod
+    def encode(value, values, codes):
+        """
+        Возвращает номер значения в словаре, добавляя новое значение при необходимости
+
+        Args:
+            value (str): Значение для кодирования
+            values (list): Список уникальных значений
+            codes (dict): Словарь номеров значений
+
+        Returns
+            int: Номер значения
+        """
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, name, area_name, salary_from, salary_to, salary_currency, published_at):
+        """
+        Добавляет вакансию в столбцы
+
+        Args:
+            name (str): Название вакансии
+            area_name (str): Название города
+            salary_from (float): Нижняя граница оклада
+            salary_to (float): Верхняя граница оклада
+            salary_currency (str): Валюта оклада
+            published_at (str): Время и дата публикации вакансии
+        """
+        self.name_ids.append(VacancyColumns.encode(name, self.names, self.name_codes))
+        self.area_ids.append(VacancyColumns.encode(area_name, self.areas, self.area_codes))
+        self.currency_ids.append(VacancyColumns.encode(salary_currency, self.currencies, self.currency_codes))
+        self.salary_from.append(salary_from)
+        self.salary_to.append(salary_to)
+        self.year.append(int(published_at[:4]))
+        self.month.append(int(published_at[5:7]))
+
+    def extend(self, other):
+        """
+        Добавляет в конец вакансии из других столбцов, перекодируя их названия, города и валюты
+
+        Args:
+            other (VacancyColumns): Вакансии по столбцам, например прочитанные другим процессом
+        """
+        name_codes = [VacancyColumns.encode(name, self.names, self.name_codes) for name in other.names]
+        area_codes = [VacancyColumns.encode(area, self.areas, self.area_codes) for area in other.areas]
+        currency_codes = [VacancyColumns.encode(currency, self.currencies, self.currency_codes)
+                          for currency in other.currencies]
+        self.name_ids.extend(name_codes[i] for i in other.name_ids)
+        self.area_ids.extend(area_codes[i] for i in other.area_ids)
+        self.currency_ids.extend(currency_codes[i] for i in other.currency_ids)
+        self.salary_from.extend(other.salary_from)
+        self.salary_to.extend(other.salary_to)
+        self.year.extend(other.year)
+        self.month.extend(other.month)
+
+    @staticmethod
+    def from_vacancies(vacancies):
+        """
+        Создает объект VacancyColumns из словарей вакансий
+
+        Args:
+            vacancies (iterable<dict>): Словари вакансий
+
+        Returns
+            VacancyColumns: Вакансии по столбцам
+        """
+        columns = VacancyColumns()
+        for vacancy in vacancies:
+            columns.append(vacancy['name'], vacancy['area_name'], vacancy['salary_from'], vacancy['salary_to'],
+                           vacancy['salary_currency'], vacancy['published_at'])
+        return columns
+
+    def get_average_salary_rub(self):
+        """
+        Вычисляет среднюю зарплату в рублях для всех вакансий
+
+        Returns
+            np.ndarray: Средние зарплаты в рублях
+        """
+        rates = np.array([Salary.currency_to_rub[currency] for currency in self.currencies], dtype=float)
+        return (np.frombuffer(self.salary_from, dtype=float) + np.frombuffer(self.salary_to, dtype=float)) / 2 * \
+            rates[np.frombuffer(self.currency_ids, dtype=np.uint8)]
 
 
 class DataSet:
@@ -102,18 +258,47 @@ class DataSet:
 
     Attributes:
         file_name (str): Название обрабатываемого файла
-        vacancies_objects (list<Vacancy>): Список вакансий
+        vacancies_objects (list<Vacancy> | VacancyColumns): Список вакансий
+        name_index (TrigramIndex): Индекс названий вакансий, строится при первом обращении
+        schema (dict): Функции преобразования полей, которые применяются вместо очистки строки
     """
 
-    def __init__(self, file_name):
+    schema = {
+        'salary_from': float,
+        'salary_to': float,
+    }
+
+    def __init__(self, file_name, streaming=False, columnar=False):
         """
         Инициализирует объект DataSet, создает список вакансий по названию файла
 
         Args:
              file_name (str): Название файла
+             streaming (bool): Читать вакансии из файла по одной вместо загрузки всего списка в память
+             columnar (bool): Хранить вакансии по столбцам в объекте VacancyColumns
         """
         self.file_name = file_name
-        self.vacancies_objects = DataSet.create_vacancies_objects(self.file_name)
+        self.streaming = streaming
+        self.name_index = None
+        if columnar:
+            self.vacancies_objects = DataSet.create_vacancies_columns(self.file_name)
+        elif streaming:
+            self.vacancies_objects = DataSet.iter_vacancies(self.file_name)
+        else:
+            self.vacancies_objects = DataSet.create_vacancies_objects(self.file_name)
+
+    def get_name_index(self):
+        """
+        Возвращает индекс названий вакансий по триграммам, при первом вызове строит его
+
+        Returns
+            TrigramIndex: Индекс названий вакансий, None в потоковом режиме
+        """
+        if self.name_index is None and not self.streaming:
+            vacancies = self.vacancies_objects
+            names = vacancies.names if isinstance(vacancies, VacancyColumns) else [v.name for v in vacancies]
+            self.name_index = TrigramIndex(names)
+        return self.name_index
 
     @staticmethod
     def csv_reader(file_name):
@@ -124,16 +309,35 @@ class DataSet:
             file_name (str): Название файла
 
         Returns
-            (list, list): Список заголовков и список с вакансиями
+            (list, generator): Список заголовков и генератор с вакансиями
         """
         file_csv = open(file_name, encoding='utf_8_sig')
         reader = csv.reader(file_csv)
-        list_data = [i for i in reader]
+        headings = next(reader, None)
 
-        if len(list_data) == 0:
+        if headings is None:
+            file_csv.close()
             print('Пустой файл')
             sys.exit()
-        return list_data[0], [i for i in list_data[1:] if '' not in i and len(i) == len(list_data[0])]
+        return headings, DataSet.read_rows(file_csv, reader, len(headings))
+
+    @staticmethod
+    def read_rows(file_csv, reader, length):
+        """
+        Построчно выдает заполненные строки файла и закрывает файл после чтения
+
+        Args:
+            file_csv (file): Открытый файл
+            reader (csv.reader): Читатель строк файла
+            length (int): Количество заголовков
+
+        Returns
+            generator: Генератор строк с вакансиями
+        """
+        with file_csv:
+            for row in reader:
+                if '' not in row and len(row) == length:
+                    yield row
 
     @staticmethod
     def create_vacancies_objects(file_name):
@@ -146,29 +350,57 @@ class DataSet:
         Returns
             list<Vacancy>: Список вакансий
         """
+        return list(DataSet.iter_vacancies(file_name))
+
+    @staticmethod
+    def iter_vacancies(file_name):
+        """
+        Построчно создает объекты Vacancy по названию файла, не загружая файл в память целиком
+
+        Args:
+            file_name (str): Название файла
+
+        Returns
+            generator: Генератор вакансий
+        """
         headings, vacancies = DataSet.csv_reader(file_name)
-        filtered_vacancies = DataSet.csv_filter(vacancies, headings)
-        vacancies_objects = [Vacancy(vacancy['name'],
-                                     vacancy['area_name'],
-                                     Salary(vacancy['salary_from'], vacancy['salary_to'], vacancy['salary_currency']),
-                                     vacancy['published_at']
-                                     ) for vacancy in filtered_vacancies]
-        return vacancies_objects
+        for vacancy in DataSet.csv_filter(vacancies, headings, Vacancy.columns):
+            yield Vacancy(vacancy['name'],
+                          vacancy['area_name'],
+                          Salary(vacancy['salary_from'], vacancy['salary_to'], vacancy['salary_currency']),
+                          vacancy['published_at'])
 
     @staticmethod
-    def csv_filter(reader, list_naming):
+    def create_vacancies_columns(file_name):
         """
-        Фильтрует список вакансий
+        Создает объект VacancyColumns по названию файла
 
         Args:
-            reader (list): Список строк с вакансиями
+            file_name (str): Название файла
+
+        Returns
+            VacancyColumns: Вакансии по столбцам
+        """
+        headings, vacancies = DataSet.csv_reader(file_name)
+        return VacancyColumns.from_vacancies(DataSet.csv_filter(vacancies, headings, Vacancy.columns))
+
+    @staticmethod
+    def csv_filter(reader, list_naming, columns=None):
+        """
+        Фильтрует список вакансий, очищает строки и преобразует поля из schema к их типу. Столбцы, которых нет
+        в columns, не очищаются и не попадают в словари
+
+        Args:
+            reader (iterable): Строки с вакансиями
             list_naming (list): Названия параметров вакансий
+            columns (list): Названия нужных столбцов, None если нужны все столбцы
 
         Returns:
-            dict: Словарь отфильтрованных вакансий
+            generator: Генератор словарей отфильтрованных вакансий
         """
-        return [{list_naming[i]: DataSet.process_vacancy(vacancy[i]) for i, v in enumerate(vacancy)} for vacancy in
-                reader]
+        projection = [(i, name, DataSet.schema.get(name, DataSet.process_vacancy))
+                      for i, name in enumerate(list_naming) if columns is None or name in columns]
+        return ({name: convert(vacancy[i]) for i, name, convert in projection} for vacancy in reader)
 
     @staticmethod
     def process_vacancy(vacancy):
@@ -181,7 +413,7 @@ class DataSet:
         Returns
             str: Очищенная строка с данными о вакансии
         """
-        return ' '.join(('; '.join(re.sub(re.compile('<.*?>'), '', vacancy).split('\n')).split()))
+        return clean(vacancy)
 
 
 class Statistics:
@@ -191,26 +423,196 @@ class Statistics:
     Attributes:
         dataset (Dataset): Датасет вакансий
         profession (str): Название профессии
+        partial (PartialStatistics): Накопленная статистика по годам, городам и профессии
+        vacancies_count (int): Общее количество вакансий
         cities (dict): Словарь вакансий по городам
-        profession_dataset (list): Список вакансий с подходящей профессией
         number_of_vacancies (dict): Словарь количества вакансий в каждом году
         number_of_vacancies_by_profession (dict): Словарь количества вакансий в каждом году с определенной профессией
+        results (dict): Уже вычисленные результаты статистики
     """
 
-    def __init__(self, dataset, profession):
+    def __init__(self, dataset, profession, partial=None):
         """
-        Инициализирует объект Statistics, подсчитывает атрибуты cities, profession_dataset, number_of_vacancies, number_of_vacancies_by_profession
+        Инициализирует объект Statistics, за один проход по вакансиям подсчитывает количество вакансий и суммы
+        зарплат по годам, городам и профессии
 
         Args:
-            dataset (Dataset): Датасет вакансий
+            dataset (Dataset): Датасет вакансий, в том числе в потоковом режиме
             profession (str): Название профессии
+            partial (PartialStatistics): Уже подсчитанная статистика, например объединенная из частей файла
         """
         self.dataset = dataset
         self.profession = profession
-        self.cities = self.get_cities()
-        self.profession_dataset = self.get_vacancies_by_profession(profession)
-        self.number_of_vacancies = self.get_number_of_vacancies()
-        self.number_of_vacancies_by_profession = self.get_number_of_vacancies_by_profession()
+        self.results = {}
+        if partial is not None:
+            self.partial = partial
+        elif isinstance(dataset.vacancies_objects, VacancyColumns):
+            self.partial = Statistics.collect_columns(dataset.vacancies_objects, profession, dataset.get_name_index())
+        elif dataset.streaming:
+            self.partial = Statistics.collect(dataset.vacancies_objects, profession)
+        else:
+            name_index = dataset.get_name_index()
+            profession_names = {name_index.values[code] for code in name_index.find_values(profession)}
+            self.partial = Statistics.collect(dataset.vacancies_objects, profession, profession_names)
+        self.vacancies_count = self.partial.vacancies_count
+        self.cities = {city: entry[0] for city, entry in self.partial.get_cities().items()}
+        self.number_of_vacancies = self.get_results()[1]
+        self.number_of_vacancies_by_profession = self.get_results()[3]
+
+    @staticmethod
+    def collect(vacancies, profession, profession_names=None):
+        """
+        Подсчитывает количество вакансий и суммы зарплат за один проход
+
+        Args:
+            vacancies (iterable<Vacancy>): Вакансии, в том числе генератор вакансий
+            profession (str): Название профессии
+            profession_names (set): Названия вакансий с профессией, найденные по индексу
+
+        Returns
+            PartialStatistics: Статистика по вакансиям
+        """
+        partial = PartialStatistics(profession)
+        for vacancy in vacancies:
+            is_profession = vacancy.name in profession_names if profession_names is not None else \
+                profession in vacancy.name
+            partial.add(vacancy.year, vacancy.area_name, vacancy.salary.average_salary_rub, is_profession)
+        return partial
+
+    @staticmethod
+    def collect_columns(columns, profession, name_index=None):
+        """
+        Подсчитывает количество вакансий и суммы зарплат по столбцам VacancyColumns
+
+        Args:
+            columns (VacancyColumns): Вакансии по столбцам
+            profession (str): Название профессии
+            name_index (TrigramIndex): Индекс по columns.names
+
+        Returns
+            PartialStatistics: Статистика по вакансиям
+        """
+        salaries = columns.get_average_salary_rub()
+        years = np.frombuffer(columns.year, dtype=np.uint16)
+        area_ids = np.frombuffer(columns.area_ids, dtype=np.uint32)
+
+        partial = PartialStatistics(profession)
+        partial.vacancies_count = len(columns)
+        Statistics.group_by(partial.years, years, salaries)
+        Statistics.group_by(partial.cities, area_ids, salaries, columns.areas)
+        if profession is not None:
+            if name_index is None:
+                matches = np.array([profession in name for name in columns.names], dtype=bool)
+            else:
+                matches = np.zeros(len(columns.names), dtype=bool)
+                matches[name_index.find_values(profession)] = True
+            profession_mask = matches[np.frombuffer(columns.name_ids, dtype=np.uint32)]
+            Statistics.group_by(partial.profession_years, years[profession_mask], salaries[profession_mask])
+        return partial
+
+    @staticmethod
+    def create_batch(dataset, professions):
+        """
+        Подсчитывает статистику сразу для нескольких профессий за один проход по вакансиям
+
+        Args:
+            dataset (Dataset): Датасет вакансий, в том числе в потоковом режиме
+            professions (list): Названия профессий
+
+        Returns
+            dict: Словарь, где каждой профессии соответствует объект Statistics
+        """
+        if isinstance(dataset.vacancies_objects, VacancyColumns):
+            partial, profession_years = Statistics.collect_batch_columns(dataset.vacancies_objects, professions)
+        else:
+            partial, profession_years = Statistics.collect_batch(dataset.vacancies_objects, professions)
+
+        batch = {}
+        for profession, years in zip(professions, profession_years):
+            profession_partial = PartialStatistics(profession)
+            profession_partial.vacancies_count = partial.vacancies_count
+            profession_partial.years = partial.years
+            profession_partial.cities = partial.cities
+            profession_partial.profession_years = years
+            batch[profession] = Statistics(dataset, profession, profession_partial)
+        return batch
+
+    @staticmethod
+    def collect_batch(vacancies, professions):
+        """
+        Подсчитывает общую статистику и статистику по годам для каждой профессии за один проход
+
+        Args:
+            vacancies (iterable<Vacancy>): Вакансии, в том числе генератор вакансий
+            professions (list): Названия профессий
+
+        Returns
+            (PartialStatistics, list): Общая статистика и группы по годам для каждой профессии
+        """
+        matcher = AhoCorasick(professions)
+        partial = PartialStatistics()
+        profession_years = [{} for _ in professions]
+        name_matches = {}
+        for vacancy in vacancies:
+            salary = vacancy.salary.average_salary_rub
+            partial.add(vacancy.year, vacancy.area_name, salary, False)
+            matches = name_matches.get(vacancy.name)
+            if matches is None:
+                matches = name_matches[vacancy.name] = matcher.find(vacancy.name)
+            for index in matches:
+                PartialStatistics.add_salary(profession_years[index], vacancy.year, salary)
+        return partial, profession_years
+
+    @staticmethod
+    def collect_batch_columns(columns, professions):
+        """
+        Подсчитывает общую статистику и статистику по годам для каждой профессии по столбцам VacancyColumns.
+        Поиск профессий выполняется один раз для каждого уникального названия вакансии
+
+        Args:
+            columns (VacancyColumns): Вакансии по столбцам
+            professions (list): Названия профессий
+
+        Returns
+            (PartialStatistics, list): Общая статистика и группы по годам для каждой профессии
+        """
+        matcher = AhoCorasick(professions)
+        name_matches = [sorted(matcher.find(name)) for name in columns.names]
+        match_counts = np.array([len(matches) for matches in name_matches], dtype=np.int64)
+        flat_matches = np.array([index for matches in name_matches for index in matches], dtype=np.int64)
+        offsets = np.cumsum(match_counts) - match_counts
+
+        name_ids = np.frombuffer(columns.name_ids, dtype=np.uint32)
+        row_counts = match_counts[name_ids]
+        rows = np.repeat(np.arange(len(columns)), row_counts)
+        starts = np.repeat(offsets[name_ids] - (np.cumsum(row_counts) - row_counts), row_counts)
+        profession_ids = flat_matches[starts + np.arange(len(rows))]
+
+        years = np.frombuffer(columns.year, dtype=np.uint16).astype(np.int64)
+        groups = {}
+        Statistics.group_by(groups, profession_ids * 65536 + years[rows], columns.get_average_salary_rub()[rows])
+        profession_years = [{} for _ in professions]
+        for key, entry in groups.items():
+            profession_years[key // 65536][key % 65536] = entry
+        return Statistics.collect_columns(columns, None), profession_years
+
+    @staticmethod
+    def group_by(groups, keys, salaries, labels=None):
+        """
+        Считает количество и сумму зарплат для каждого ключа в порядке первого появления ключа
+
+        Args:
+            groups (dict): Группы PartialStatistics, в которые добавляются данные
+            keys (np.ndarray): Ключи группировки
+            salaries (np.ndarray): Зарплаты
+            labels (list): Названия ключей, если ключи закодированы номерами
+        """
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(unique))
+        sums = np.bincount(inverse, weights=salaries, minlength=len(unique))
+        for i in np.argsort(first):
+            key = int(unique[i]) if labels is None else labels[unique[i]]
+            PartialStatistics.add_group(groups, key, int(counts[i]), int(counts[i]), float(sums[i]))
 
     def get_vacancies_by_profession(self, profession):
         """
@@ -222,30 +624,29 @@ class Statistics:
         Returns
             list: Список подходящих вакансий
         """
-        return [vacancy for vacancy in self.dataset.vacancies_objects if profession in vacancy.name]
+        name_index = self.dataset.get_name_index()
+        if name_index is None:
+            return [vacancy for vacancy in self.dataset.vacancies_objects if profession in vacancy.name]
+        return [self.dataset.vacancies_objects[i] for i in name_index.find(profession)]
 
-    def get_salary_level(self):
+    @memoize
+    def get_results(self):
         """
-        Подсчитывает среднюю зарплату в каждом году
+        Возвращает все результаты статистики, вычисленные по накопленным за один проход данным
 
         Returns
-            dict: Словарь, где каждом году соответствует средняя зарплата в этом году
+            list: Список словарей со статистикой
         """
-        salary_level = {v: 0 for v in self.number_of_vacancies.keys()}
-        for vacancy in self.dataset.vacancies_objects:
-            salary_level[vacancy.get_year()] += vacancy.salary.get_average_salary_rub()
-        return {year: int(level / self.number_of_vacancies[year]) for year, level in salary_level.items()}
+        return self.partial.finalize()
 
-    def get_cities(self):
+    def get_salary_level(self):
         """
-        Подсчитывает количество вакансий в каждом городе
+        Подсчитывает среднюю зарплату в каждом году
 
         Returns
-            dict: Словарь, где каждому городу соответсвует количество вакансий в этом городе
+            dict: Словарь, где каждом году соответствует средняя зарплата в этом году
         """
-        return {city: vacancies for city, vacancies in
-                Counter(v.area_name for v in self.dataset.vacancies_objects).items() if
-                vacancies / len(self.dataset.vacancies_objects) >= 0.01}
+        return self.get_results()[0]
 
     def get_number_of_vacancies(self):
         """
@@ -254,7 +655,7 @@ class Statistics:
         Returns
             dict: Словарь, где каждому году соотвествует количество вакансий в этом году
         """
-        return dict(Counter(v.get_year() for v in self.dataset.vacancies_objects))
+        return self.get_results()[1]
 
     def get_salary_level_by_profession(self):
         """
@@ -263,14 +664,7 @@ class Statistics:
         Returns
             dict: Словарь, где каждому году соответствует средняя зарплата в этом году по определенной профессии
         """
-        number_of_vacancies = self.number_of_vacancies_by_profession
-        salary_level = {v: 0 for v in number_of_vacancies.keys()}
-        for vacancy in self.profession_dataset:
-            salary_level[vacancy.get_year()] += vacancy.salary.get_average_salary_rub()
-
-        salary_level = {year: int(level / number_of_vacancies[year]) for year, level in salary_level.items() if
-                        number_of_vacancies[year] != 0}
-        return salary_level if len(salary_level) > 0 else {year: 0 for year in number_of_vacancies.keys()}
+        return self.get_results()[2]
 
     def get_number_of_vacancies_by_profession(self):
         """
@@ -279,9 +673,7 @@ class Statistics:
         Returns
             dict: Словарь, где каждому году соответствует количество вакансий в этом году по определенной профессии
         """
-        vacancies_by_profession = dict(Counter(v.get_year() for v in self.profession_dataset))
-        return vacancies_by_profession if len(vacancies_by_profession) > 0 else {year: 0 for year in
-                                                                                 self.number_of_vacancies.keys()}
+        return self.get_results()[3]
 
     def get_salary_level_by_city(self):
         """
@@ -290,14 +682,7 @@ class Statistics:
         Return
             dict: Словарь, где каждому городу соответсвует его средняя зарплата
         """
-        salary_level = {city: 0 for city in self.cities.keys()}
-        for vacancy in self.dataset.vacancies_objects:
-            if vacancy.area_name in salary_level.keys():
-                salary_level[vacancy.area_name] += vacancy.salary.get_average_salary_rub()
-        return Statistics.get_first_n_elems(dict(
-            sorted({city: int(salary / self.cities[city]) for city, salary in salary_level.items()}.items(),
-                   key=lambda v: v[1],
-                   reverse=True)), 10)
+        return self.get_results()[4]
 
     def get_share_of_vacancies_by_city(self):
         """
@@ -306,11 +691,7 @@ class Statistics:
         Returns
             dict: Словарь, где каждому городу соотвествует его часть от общего количества вакансий
         """
-        return Statistics.get_first_n_elems(
-            dict(sorted({k: round(v / len(self.dataset.vacancies_objects), 4) for k, v in
-                         self.cities.items()
-                         }.items(),
-                        key=lambda v: v[1], reverse=True)), 10)
+        return self.get_results()[5]
 
     def dict_to_output(self, d, start):
         """
@@ -343,15 +724,12 @@ class Statistics:
         """
         Выводит результаты обработки в консоль
         """
-        print(self.dict_to_output(self.get_salary_level(), 'Динамика уровня зарплат по годам'))
-        print(self.dict_to_output(self.number_of_vacancies, 'Динамика количества вакансий по годам'))
-        print(self.dict_to_output(self.get_salary_level_by_profession(),
-                                  'Динамика уровня зарплат по годам для выбранной профессии'))
-        print(self.dict_to_output(self.number_of_vacancies_by_profession,
-                                  'Динамика количества вакансий по годам для выбранной профессии'))
-        print(self.dict_to_output(self.get_salary_level_by_city(), 'Уровень зарплат по городам (в порядке убывания)'))
-        print(
-            self.dict_to_output(self.get_share_of_vacancies_by_city(), 'Доля вакансий по городам (в порядке убывания)'))
+        outputs = ['Динамика уровня зарплат по годам', 'Динамика количества вакансий по годам',
+                   'Динамика уровня зарплат по годам для выбранной профессии',
+                   'Динамика количества вакансий по годам для выбранной профессии',
+                   'Уровень зарплат по городам (в порядке убывания)', 'Доля вакансий по городам (в порядке убывания)']
+        for d, start in zip(self.get_results(), outputs):
+            print(self.dict_to_output(d, start))
 
 
 class Interface:
@@ -413,10 +791,7 @@ class Report:
         Returns
             list: Список словарей с нужной статистикой
         """
-        return [self.statistics.get_salary_level(), self.statistics.number_of_vacancies,
-                self.statistics.get_salary_level_by_profession(), self.statistics.number_of_vacancies_by_profession,
-                self.statistics.get_first_n_elems(self.statistics.get_salary_level_by_city(), 10),
-                self.statistics.get_first_n_elems(self.statistics.get_share_of_vacancies_by_city(), 10)]
+        return self.statistics.get_results()
 
     def generate_excel(self, dicts):
         """
@@ -591,7 +966,7 @@ def get_pdf():
     Формирует файл pdf со статистикой
     """
     inputs = Interface()
-    dataset = DataSet(inputs.file_name)
+    dataset = DataSet(inputs.file_name, streaming=True)
     statistics = Statistics(dataset, inputs.profession)
     statistics.print_result()
 
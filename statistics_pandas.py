@@ -1,41 +1,83 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from aggregates import PartialStatistics
+from text_search import AhoCorasick, TrigramIndex
 
+columns = ['name', 'salary', 'area_name', 'published_at']
 
-def get_main_statistics(file_name, vacancy, return_dict):
+
+def add_groups(groups, grouped):
+    for key, (count, salary_count, salary_sum) in grouped['salary'].agg(['size', 'count', 'sum']).iterrows():
+        PartialStatistics.add_group(groups, key, int(count), int(salary_count), float(salary_sum))
+
+
+def get_years(df):
+    return df['published_at'].apply(lambda d: datetime.strptime(d, '%Y-%m-%dT%H:%M:%S%z').year)
+
+
+def get_name_index(df):
+    return TrigramIndex(df['name'].fillna(''))
+
+
+def get_partial_statistics(df, vacancy, name_index=None):
+    years = get_years(df)
+
+    partial = PartialStatistics(vacancy)
+    partial.vacancies_count = len(df.index)
+    add_groups(partial.years, df.groupby(years, sort=False))
+    add_groups(partial.cities, df.groupby('area_name', sort=False))
+    if vacancy is not None:
+        if name_index is None:
+            is_vacancy = df['name'].str.contains(vacancy)
+        else:
+            is_vacancy = np.zeros(len(df.index), dtype=bool)
+            is_vacancy[name_index.find(vacancy)] = True
+        add_groups(partial.profession_years, df[is_vacancy].groupby(years[is_vacancy], sort=False))
+    return partial
+
+
+def get_batch_statistics(file_name, vacancies):
     pd.set_option('expand_frame_repr', False)
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=columns)
+    partial = get_partial_statistics(df, None)
+
+    matcher = AhoCorasick(vacancies)
+    matches = {name: sorted(matcher.find(name)) for name in df['name'].dropna().unique()}
+    df_matches = df.assign(year=get_years(df), vacancy_index=df['name'].map(matches)).explode('vacancy_index')
+    df_matches = df_matches.dropna(subset=['vacancy_index'])
 
-    df['published_at'] = df['published_at'].apply(lambda d: datetime.strptime(d, '%Y-%m-%dT%H:%M:%S%z').year)
-    year = int(df['published_at'].unique())
-    df_vacancy = df[df['name'].str.contains(vacancy)]
+    profession_years = [{} for _ in vacancies]
+    grouped = df_matches.groupby(['vacancy_index', 'year'], sort=False)['salary'].agg(['size', 'count', 'sum'])
+    for (index, year), (count, salary_count, salary_sum) in grouped.iterrows():
+        PartialStatistics.add_group(profession_years[index], year, int(count), int(salary_count), float(salary_sum))
 
-    salary_level = int(df['salary'].mean())
-    number_of_vacancies = len(df.index)
-    salary_level_by_profession = int(df_vacancy['salary'].mean())
-    number_of_vacancies_by_profession = len(df_vacancy.index)
-    return_dict[year] = [salary_level, number_of_vacancies, salary_level_by_profession,
-                         number_of_vacancies_by_profession]
+    batch = {}
+    for vacancy, years in zip(vacancies, profession_years):
+        batch[vacancy] = PartialStatistics(vacancy)
+        batch[vacancy].vacancies_count = partial.vacancies_count
+        batch[vacancy].years = partial.years
+        batch[vacancy].cities = partial.cities
+        batch[vacancy].profession_years = years
+    return batch
+
+
+def get_main_statistics(file_name, vacancy):
+    pd.set_option('expand_frame_repr', False)
+    df = pd.read_csv(file_name, usecols=columns)
+    return get_partial_statistics(df, vacancy)
 
 
-def get_main_statistics_by_city(file_name, vacancy, city, return_dict):
+def get_main_statistics_by_city(file_name, vacancy, city):
     pd.set_option('expand_frame_repr', False)
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=columns)
     df = df[df['area_name'] == city]
-    df['published_at'] = df['published_at'].apply(lambda d: datetime.strptime(d, '%Y-%m-%dT%H:%M:%S%z').year)
-    year = int(df['published_at'].unique())
-    df_vacancy = df[df['name'].str.contains(vacancy)]
-    salary_level = int(df['salary'].mean())
-    number_of_vacancies = len(df.index)
-    salary_level_by_profession = int(df_vacancy['salary'].mean())
-    number_of_vacancies_by_profession = len(df_vacancy.index)
-    return_dict[year] = [salary_level, number_of_vacancies, salary_level_by_profession,
-                         number_of_vacancies_by_profession]
+    return get_partial_statistics(df, vacancy)
 
 
 def get_city_statistics(file_name):
     pd.set_option('expand_frame_repr', False)
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=columns)
     df_length = len(df.index)
 
     df['count'] = df.groupby('area_name')['area_name'].transform('count')
@@ -1,8 +1,19 @@
 import csv
+import heapq
+import json
+import os
 import re
+from itertools import chain, islice
+from openpyxl import Workbook
 from prettytable import PrettyTable
 from datetime import datetime
+from functools import lru_cache
 import sys
+import time
+from text_search import TrigramIndex
+from indexes import IntervalTree, SkillsIndex
+from external_sort import external_sort
+from cleaning import clean, clean_rows
 
 
 class Salary:
@@ -70,12 +81,29 @@ class Salary:
         >>> Salary('700', '800', 'False', 'KZT').get_salary()
         '700 - 800 (Тенге) (С вычетом налогов)'
         """
-        salary_from = int(float(self.salary_from))
-        salary_to = int(float(self.salary_to))
+        return Salary.format_salary(self.salary_from, self.salary_to, self.salary_gross, self.salary_currency)
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def format_salary(salary_from, salary_to, salary_gross, salary_currency):
+        """
+        Объединяет данные о зарплате в одну строку, результаты кэшируются, так как одинаковые вилки встречаются часто
+
+        Args:
+            salary_from (str): Нижняя граница вилки оклада
+            salary_to (str): Верхняя граница вилки оклада
+            salary_gross (str): Оклад указан до вычета налогов
+            salary_currency (str): Валюта оклада
+
+        Returns
+            str: Строка с данными о зарплате
+        """
+        salary_from = int(float(salary_from))
+        salary_to = int(float(salary_to))
         salary_from = ' '.join(f'{salary_from:,}'.split(','))
         salary_to = ' '.join(f'{salary_to:,}'.split(','))
-        formatted_currency = self.currency[self.salary_currency]
-        salary_gross = 'С вычетом налогов' if self.salary_gross == 'False' else 'Без вычета налогов'
+        formatted_currency = Salary.currency[salary_currency]
+        salary_gross = 'С вычетом налогов' if salary_gross == 'False' else 'Без вычета налогов'
         return f'{salary_from} - {salary_to} ({formatted_currency}) ({salary_gross})'
 
     def get_average_salary_rub(self):
@@ -145,6 +173,9 @@ class Vacancy:
         self.area_name = area_name
         self.published_at = published_at
 
+    columns = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+               'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+
 
 class DataSet:
     """
@@ -152,17 +183,42 @@ class DataSet:
 
     Attributes:
         file_name (str): Название обрабатываемого файла
-        vacancies_objects (list<Vacancy>): Список вакансий
+        all_vacancies (list<Vacancy>): Список всех загруженных вакансий
+        row_ids (list<int>): Номера выбранных вакансий в all_vacancies, None если выбраны все вакансии
+        vacancies_objects (list<Vacancy>): Список выбранных вакансий
+        name_index (TrigramIndex): Индекс названий вакансий из all_vacancies
+        indexes (dict): Уже построенные индексы полей из index_table и индекс окладов
+        sort_keys (dict): Уже вычисленные ключи сортировки, где каждому параметру сортировки соответствует
+            список ключей для всех вакансий из all_vacancies
+        skills_index (SkillsIndex): Инвертированный индекс навыков, строится при загрузке вакансий
+        streaming (bool): Потоковый режим, в котором вакансии не загружаются в память, а vacancies_objects -
+            итератор, который фильтруется на лету и сортируется внешней сортировкой
+        chunk_size (int): Максимальное количество вакансий, которые сортируются в памяти в потоковом режиме
     """
-    def __init__(self, file_name):
+    def __init__(self, file_name, streaming=False, chunk_size=100000, processes=1):
         """
         Инициализирует объект DataSet, создает список вакансий по названию файла
 
         Args:
              file_name (str): Название файла
+             streaming (bool): Читать ли вакансии потоково, не загружая их в память
+             chunk_size (int): Максимальное количество вакансий, которые сортируются в памяти
+             processes (int): Количество процессов для очистки строк, None для всех ядер
         """
         self.file_name = file_name
-        self.vacancies_objects = DataSet.create_vacancies_objects(self.file_name)
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.all_vacancies = []
+        self.skills_index = SkillsIndex()
+        if not streaming:
+            for vacancy in DataSet.iter_vacancies(self.file_name, processes):
+                self.skills_index.add(len(self.all_vacancies), vacancy.key_skills)
+                self.all_vacancies.append(vacancy)
+        self.row_ids = None
+        self.vacancies_objects = DataSet.iter_vacancies(self.file_name, processes) if streaming else self.all_vacancies
+        self.name_index = None
+        self.indexes = {}
+        self.sort_keys = {}
 
     en_to_rus_headings = {
         'name': 'Название',
@@ -195,6 +251,7 @@ class DataSet:
         'True': 'Да',
         'False': 'Нет'
     }
+    translations = {**bools, **experience, **Salary.currency}
 
     filter_table = {
         'Название': lambda f, d: f == d.name,
@@ -205,7 +262,30 @@ class DataSet:
         'Опыт работы': lambda f, d: f == DataSet.experience[d.experience_id],
         'Дата публикации вакансии': lambda f, d: f == DataSet.format_date(d),
         'Навыки': lambda f, d: set(f.split(', ')).issubset(d.key_skills),
-        'Оклад': lambda f, d: int(float(d.salary.salary_from)) <= int(f) <= int(float(d.salary.salary_to))
+        'Оклад': lambda f, d: DataSet.check_salary(f, d)
+    }
+    filter_fields = '|'.join(map(re.escape, filter_table))
+    or_separator = re.compile(rf' \| (?=(?:{filter_fields}): )')
+    and_separator = re.compile(f' & (?=(?:{filter_fields}): )')
+
+    index_table = {
+        'Компания': lambda d: d.employer_name,
+        'Название региона': lambda d: d.area_name,
+        'Премиум-вакансия': lambda d: DataSet.bools[d.premium],
+        'Идентификатор валюты оклада': lambda d: d.salary.get_currency(),
+        'Опыт работы': lambda d: DataSet.experience[d.experience_id],
+        'Дата публикации вакансии': lambda d: DataSet.format_date(d),
+    }
+
+    field_selectivity = {
+        'Название': 0.001,
+        'Компания': 0.005,
+        'Дата публикации вакансии': 0.005,
+        'Название региона': 0.05,
+        'Оклад': 0.2,
+        'Опыт работы': 0.3,
+        'Идентификатор валюты оклада': 0.5,
+        'Премиум-вакансия': 0.5
     }
 
     sort_table = {
@@ -231,12 +311,54 @@ class DataSet:
         'Название региона': lambda row: row.area_name,
         'Дата публикации вакансии': lambda row: DataSet.format_date(row)
     }
+    repeated_fields = {'Опыт работы', 'Премиум-вакансия', 'Компания', 'Оклад', 'Название региона',
+                       'Дата публикации вакансии'}
+
+    export_table = {
+        '.csv': lambda *args: DataSet.export_csv(*args),
+        '.jsonl': lambda *args: DataSet.export_jsonl(*args),
+        '.xlsx': lambda *args: DataSet.export_xlsx(*args),
+    }
 
     @staticmethod
     def format_date(date):
-        d = date.published_at
+        return DataSet.format_published_at(date.published_at)
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def format_published_at(d):
+        """
+        Переводит дату публикации в формат ДД.ММ.ГГГГ, результаты кэшируются
+
+        Args:
+            d (str): Дата и время публикации вакансии
+
+        Returns
+            str: Дата публикации
+
+        >>> DataSet.format_published_at('2022-07-13T11:03:58+0300')
+        '13.07.2022'
+        """
         return d[8:10] + '.' + d[5:7] + '.' + d[:4]
 
+    @staticmethod
+    def get_cache_stats():
+        """
+        Собирает статистику кэшей форматирования
+
+        Returns
+            dict: Словарь, где каждому кэшу соответствует словарь с количеством попаданий, промахов и долей попаданий
+        """
+        stats = {}
+        for name, function in [('format_repeated_value', DataSet.format_repeated_value),
+                               ('format_published_at', DataSet.format_published_at),
+                               ('format_salary', Salary.format_salary)]:
+            info = function.cache_info()
+            calls = info.hits + info.misses
+            stats[name] = {'hits': info.hits, 'misses': info.misses,
+                           'hit_rate': round(info.hits / calls, 4) if calls else 0}
+        return stats
+
     @staticmethod
     def csv_reader(file_name):
         """
@@ -246,16 +368,35 @@ class DataSet:
             file_name (str): Название файла
 
         Returns
-            (list, list): Список заголовков и список с вакансиями
+            (list, generator): Список заголовков и генератор с вакансиями
         """
         file_csv = open(file_name, encoding='utf_8_sig')
         reader = csv.reader(file_csv)
-        list_data = [i for i in reader]
+        headings = next(reader, None)
 
-        if len(list_data) == 0:
+        if headings is None:
+            file_csv.close()
             print('Пустой файл')
             sys.exit()
-        return list_data[0], [i for i in list_data[1:] if '' not in i and len(i) == len(list_data[0])]
+        return headings, DataSet.read_rows(file_csv, reader, len(headings))
+
+    @staticmethod
+    def read_rows(file_csv, reader, length):
+        """
+        Построчно выдает заполненные строки файла и закрывает файл после чтения
+
+        Args:
+            file_csv (file): Открытый файл
+            reader (csv.reader): Читатель строк файла
+            length (int): Количество заголовков
+
+        Returns
+            generator: Генератор строк с вакансиями
+        """
+        with file_csv:
+            for row in reader:
+                if '' not in row and len(row) == length:
+                    yield row
 
     @staticmethod
     def create_vacancies_objects(file_name):
@@ -268,35 +409,52 @@ class DataSet:
         Returns
             list<Vacancy>: Список вакансий
         """
+        return list(DataSet.iter_vacancies(file_name))
+
+    @staticmethod
+    def iter_vacancies(file_name, processes=1):
+        """
+        Построчно создает объекты Vacancy по названию файла, не загружая файл в память целиком
+
+        Args:
+            file_name (str): Название файла
+            processes (int): Количество процессов для очистки строк, None для всех ядер
+
+        Returns
+            generator: Генератор вакансий
+        """
         headings, vacancies = DataSet.csv_reader(file_name)
-        filtered_vacancies = DataSet.csv_filter(vacancies, headings)
-        vacancies_objects = [Vacancy(vacancy['name'],
-                                     vacancy['description'],
-                                     [skill for skill in vacancy['key_skills'].split('; ')],
-                                     vacancy['experience_id'],
-                                     vacancy['premium'],
-                                     vacancy['employer_name'],
-                                     Salary(vacancy['salary_from'], vacancy['salary_to'],
-                                            vacancy['salary_gross'], vacancy['salary_currency']),
-                                     vacancy['area_name'],
-                                     vacancy['published_at']
-                                     ) for vacancy in filtered_vacancies]
-        return vacancies_objects
+        for vacancy in DataSet.csv_filter(vacancies, headings, processes, Vacancy.columns):
+            yield Vacancy(vacancy['name'],
+                          vacancy['description'],
+                          [skill for skill in vacancy['key_skills'].split('; ')],
+                          vacancy['experience_id'],
+                          vacancy['premium'],
+                          vacancy['employer_name'],
+                          Salary(vacancy['salary_from'], vacancy['salary_to'],
+                                 vacancy['salary_gross'], vacancy['salary_currency']),
+                          vacancy['area_name'],
+                          vacancy['published_at'])
 
     @staticmethod
-    def csv_filter(reader, list_naming):
+    def csv_filter(reader, list_naming, processes=1, columns=None):
         """
-        Фильтрует список вакансий
+        Фильтрует список вакансий. Столбцы, которых нет в columns, не очищаются и не попадают в словари
 
         Args:
-            reader (list): Список строк с вакансиями
+            reader (iterable): Строки с вакансиями
             list_naming (list): Названия параметров вакансий
+            processes (int): Количество процессов для очистки строк, None для всех ядер
+            columns (list): Названия нужных столбцов, None если нужны все столбцы
 
         Returns:
-            dict: Словарь отфильтрованных вакансий
+            generator: Генератор словарей отфильтрованных вакансий
         """
-        return [{list_naming[i]: DataSet.process_vacancy(vacancy[i]) for i, v in enumerate(vacancy)} for vacancy in
-                reader]
+        indexes = [i for i, name in enumerate(list_naming) if columns is None or name in columns]
+        if len(indexes) < len(list_naming):
+            list_naming = [list_naming[i] for i in indexes]
+            reader = ([vacancy[i] for i in indexes] for vacancy in reader)
+        return (dict(zip(list_naming, vacancy)) for vacancy in clean_rows(reader, processes))
 
     @staticmethod
     def process_vacancy(vacancy):
@@ -316,35 +474,311 @@ class DataSet:
         >>> DataSet.process_vacancy('Требования: ответственность, трудолюбие <p> </p> ')
         'Требования: ответственность, трудолюбие'
         """
-        return ' '.join(('; '.join(re.sub(re.compile('<.*?>'), '', vacancy).split('\n')).split()))
+        return clean(vacancy)
+
+    def get_name_index(self):
+        """
+        Возвращает индекс названий вакансий по триграммам, при первом вызове строит его
+
+        Returns
+            TrigramIndex: Индекс названий вакансий
+        """
+        if self.name_index is None:
+            self.name_index = TrigramIndex(vacancy.name for vacancy in self.all_vacancies)
+        return self.name_index
+
+    def get_index(self, field):
+        """
+        Возвращает индекс поля из index_table, при первом вызове строит его
+
+        Args:
+            field (str): Название поля
+
+        Returns
+            dict: Словарь, где каждому значению поля соответствует список номеров вакансий в all_vacancies
+        """
+        if field not in self.indexes:
+            index = {}
+            key = DataSet.index_table[field]
+            for row_id, vacancy in enumerate(self.all_vacancies):
+                index.setdefault(key(vacancy), []).append(row_id)
+            self.indexes[field] = index
+        return self.indexes[field]
+
+    def get_salary_index(self):
+        """
+        Возвращает дерево отрезков окладов, при первом вызове строит его
+
+        Returns
+            IntervalTree: Дерево отрезков окладов с номерами вакансий в all_vacancies
+        """
+        if 'Оклад' not in self.indexes:
+            self.indexes['Оклад'] = IntervalTree(
+                (int(float(vacancy.salary.salary_from)), int(float(vacancy.salary.salary_to)), row_id)
+                for row_id, vacancy in enumerate(self.all_vacancies))
+        return self.indexes['Оклад']
+
+    @staticmethod
+    def parse_salary(parameter):
+        """
+        Переводит значение фильтра по окладу в отрезок
+
+        Args:
+            parameter (str): Оклад или диапазон окладов через ' - '
+
+        Returns
+            (int, int): Начало и конец отрезка
+
+        >>> DataSet.parse_salary('120000')
+        (120000, 120000)
+        >>> DataSet.parse_salary('100000 - 150000')
+        (100000, 150000)
+        """
+        bounds = parameter.split(' - ')
+        return int(bounds[0]), int(bounds[-1])
+
+    @staticmethod
+    def check_salary(parameter, vacancy):
+        """
+        Проверяет, пересекается ли вилка оклада вакансии с окладом или диапазоном окладов из фильтра
+
+        Args:
+            parameter (str): Оклад или диапазон окладов через ' - '
+            vacancy (Vacancy): Вакансия
+
+        Returns
+            bool: Подходит ли вакансия
+        """
+        start, end = DataSet.parse_salary(parameter)
+        return int(float(vacancy.salary.salary_from)) <= end and start <= int(float(vacancy.salary.salary_to))
+
+    def get_skills_by_year(self):
+        """
+        Подсчитывает частоту навыков в каждом году по индексу навыков
+
+        Returns
+            dict: Словарь, где каждому году соответствует словарь навыков с количеством по убыванию
+        """
+        return self.skills_index.count_by_year([int(vacancy.published_at[:4]) for vacancy in self.all_vacancies])
+
+    def get_row_ids(self):
+        """
+        Возвращает номера выбранных вакансий
+
+        Returns
+            list: Номера выбранных вакансий в all_vacancies
+        """
+        return list(range(len(self.all_vacancies))) if self.row_ids is None else self.row_ids
+
+    def set_row_ids(self, row_ids):
+        """
+        Выбирает вакансии по их номерам в all_vacancies
+
+        Args:
+            row_ids (list): Номера выбранных вакансий
+        """
+        self.row_ids = list(row_ids)
+        self.vacancies_objects = [self.all_vacancies[i] for i in self.row_ids]
+
+    def reset_selection(self):
+        """
+        Отменяет фильтрацию и сортировку, выбирая все загруженные вакансии
+        """
+        self.row_ids = None
+        self.vacancies_objects = self.all_vacancies
+
+    def find_rows(self, field, parameter):
+        """
+        Находит по индексу вакансии, подходящие под фильтр
+
+        Args:
+            field (str): Поле фильтрации
+            parameter (str): Значение фильтра
+
+        Returns
+            list: Номера подходящих вакансий в all_vacancies, None если для поля нет индекса
+        """
+        if field in DataSet.index_table:
+            return self.get_index(field).get(parameter, [])
+        if field == 'Название':
+            return [i for i in self.get_name_index().find(parameter) if self.all_vacancies[i].name == parameter]
+        if field == 'Оклад':
+            return self.get_salary_index().overlap(*DataSet.parse_salary(parameter))
+        if field == 'Навыки':
+            return self.skills_index.find_all(parameter.split(', '))
+        return None
+
+    @staticmethod
+    def split_filter(filter_parameter):
+        """
+        Делит составной параметр фильтрации на группы условий. Разделители ' | ' и ' & ' учитываются, только если
+        за ними идет название поля фильтрации и ': ', поэтому значения вроде 'Procter & Gamble' не делятся
+
+        Args:
+            filter_parameter (str): Параметр фильтрации
+
+        Returns
+            list: Список групп, каждая группа - список строк условий
+
+        >>> DataSet.split_filter('Компания: Procter & Gamble & Навыки: C++ | C#')
+        [['Компания: Procter & Gamble', 'Навыки: C++ | C#']]
+        """
+        return [DataSet.and_separator.split(clause) for clause in DataSet.or_separator.split(filter_parameter)]
+
+    @staticmethod
+    def parse_filter(filter_parameter):
+        """
+        Разбирает составной параметр фильтрации в дизъюнкцию конъюнкций: условия через ' & ' объединяются
+        через И, группы условий через ' | ' объединяются через ИЛИ
+
+        Args:
+            filter_parameter (str): Параметр фильтрации
+
+        Returns
+            list: Список групп, каждая группа - список пар (поле, значение)
+
+        >>> DataSet.parse_filter('Компания: Контур & Опыт работы: Нет опыта | Название региона: Москва')
+        [[('Компания', 'Контур'), ('Опыт работы', 'Нет опыта')], [('Название региона', 'Москва')]]
+        """
+        clauses = []
+        for clause in DataSet.split_filter(filter_parameter):
+            conditions = []
+            for condition in clause:
+                condition = condition.split(': ')
+                field = condition[0] if len(condition) >= 1 else ''
+                parameter = condition[1] if len(condition) == 2 else ''
+                conditions.append((field, parameter))
+            clauses.append(conditions)
+        return clauses
+
+    def estimate_rows(self, field, parameter):
+        """
+        Оценивает количество вакансий, подходящих под условие. Используются только уже построенные индексы,
+        для остальных полей оценка берется из field_selectivity, чтобы выбор условия не требовал прохода по вакансиям
+
+        Args:
+            field (str): Поле фильтрации
+            parameter (str): Значение фильтра
+
+        Returns
+            float: Оценка количества подходящих вакансий
+        """
+        if field in DataSet.index_table and field in self.indexes:
+            return len(self.indexes[field].get(parameter, []))
+        if field == 'Название' and self.name_index is not None:
+            return sum(len(self.name_index.rows[code]) for code in self.name_index.find_values(parameter))
+        if field == 'Оклад' and 'Оклад' in self.indexes:
+            return self.indexes['Оклад'].count(*DataSet.parse_salary(parameter))
+        if field == 'Навыки':
+            return min(len(self.skills_index.postings.get(skill, [])) for skill in parameter.split(', '))
+        return len(self.all_vacancies) * DataSet.field_selectivity.get(field, 1)
+
+    def find_clause_rows(self, conditions):
+        """
+        Находит вакансии, подходящие под все условия группы. Сначала по индексу выбираются вакансии для
+        самого избирательного условия, остальные условия проверяются только на них
+
+        Args:
+            conditions (list): Пары (поле, значение)
+
+        Returns
+            list: Номера подходящих вакансий в all_vacancies по возрастанию
+        """
+        conditions = sorted(conditions, key=lambda condition: self.estimate_rows(*condition))
+        row_ids = self.find_rows(*conditions[0])
+        if row_ids is None:
+            row_ids = range(len(self.all_vacancies))
+        for field, parameter in conditions[1:]:
+            row_ids = [i for i in row_ids if DataSet.filter_table[field](parameter, self.all_vacancies[i])]
+        return row_ids
+
+    @staticmethod
+    def check_clauses(clauses, vacancy):
+        """
+        Проверяет, подходит ли вакансия под составной фильтр
+
+        Args:
+            clauses (list): Группы условий из parse_filter
+            vacancy (Vacancy): Вакансия
+
+        Returns
+            bool: Подходит ли вакансия
+        """
+        return any(all(DataSet.filter_table[field](parameter, vacancy) for field, parameter in conditions)
+                   for conditions in clauses)
 
     def filter_vacancies(self, filter_parameter):
         """
-        Фильтрует вакансии по заданному параметру
+        Фильтрует вакансии по заданному параметру, в том числе составному
 
         Args:
             filter_parameter (str): Параметр фильтрации
         """
         if filter_parameter == '':
             return self.vacancies_objects
-        filter_parameter = filter_parameter.split(': ')
-        field = filter_parameter[0] if len(filter_parameter) >= 1 else ''
-        parameter = filter_parameter[1] if len(filter_parameter) == 2 else ''
-
-        self.vacancies_objects = list(
-            filter(lambda vacancy: DataSet.filter_table[field](parameter, vacancy), self.vacancies_objects))
+        clauses = DataSet.parse_filter(filter_parameter)
+
+        if self.streaming:
+            self.vacancies_objects = (vacancy for vacancy in self.vacancies_objects
+                                      if DataSet.check_clauses(clauses, vacancy))
+            if not self.has_vacancies():
+                print('Ничего не найдено')
+                sys.exit()
+            return
+
+        if len(clauses) == 1:
+            row_ids = self.find_clause_rows(clauses[0])
+        else:
+            row_ids = sorted(set().union(*(self.find_clause_rows(conditions) for conditions in clauses)))
+        if self.row_ids is not None:
+            found = set(row_ids)
+            row_ids = [i for i in self.row_ids if i in found]
+        self.set_row_ids(row_ids)
 
         if not self.vacancies_objects:
             print('Ничего не найдено')
             sys.exit()
 
-    def sort_vacancies(self, parameter, order):
+    def has_vacancies(self):
         """
-        Сортирует вакансии по заданному параметру и порядку
+        Проверяет, есть ли выбранные вакансии. В потоковом режиме читает первую вакансию и возвращает ее
+        обратно в начало итератора
+
+        Returns
+            bool: Есть ли выбранные вакансии
+        """
+        if not self.streaming:
+            return len(self.vacancies_objects) > 0
+        first = next(self.vacancies_objects, None)
+        if first is None:
+            return False
+        self.vacancies_objects = chain([first], self.vacancies_objects)
+        return True
+
+    def get_sort_keys(self, parameter):
+        """
+        Возвращает ключи сортировки по параметру для всех вакансий, при первом вызове вычисляет их
 
         Args:
             parameter (str): Параметр сортировки
+
+        Returns
+            list: Ключи сортировки для каждой вакансии из all_vacancies
+        """
+        if parameter not in self.sort_keys:
+            key = DataSet.sort_table[parameter]
+            self.sort_keys[parameter] = [key(vacancy) for vacancy in self.all_vacancies]
+        return self.sort_keys[parameter]
+
+    def sort_vacancies(self, parameter, order, limit=None):
+        """
+        Сортирует вакансии по заданному параметру и порядку. Если нужны только первые limit вакансий,
+        выбирает их через кучу без полной сортировки
+
+        Args:
+            parameter (str): Параметр сортировки или несколько параметров через ', '
             order (str): Порядок сортировки
+            limit (int): Количество первых вакансий, которые нужно оставить, None если нужны все вакансии
         """
         if parameter == '':
             return self.vacancies_objects
@@ -352,26 +786,48 @@ class DataSet:
             order = False
 
         order = order == 'Да'
-        self.vacancies_objects.sort(key=DataSet.sort_table[parameter], reverse=order)
-
-    def create_table(self):
+        if self.streaming:
+            keys = [DataSet.sort_table[p] for p in parameter.split(', ')]
+            key = keys[0] if len(keys) == 1 else lambda vacancy: tuple(k(vacancy) for k in keys)
+            if limit is not None and limit > 0:
+                self.vacancies_objects = iter((heapq.nlargest if order else heapq.nsmallest)(
+                    limit, self.vacancies_objects, key=key))
+            else:
+                self.vacancies_objects = external_sort(self.vacancies_objects, key, order, self.chunk_size)
+            return
+
+        keys = [self.get_sort_keys(p) for p in parameter.split(', ')]
+        if len(keys) == 1:
+            key = keys[0].__getitem__
+        else:
+            key = lambda i: tuple(k[i] for k in keys)
+        row_ids = self.get_row_ids()
+        if limit is not None and 0 < limit < len(row_ids):
+            self.set_row_ids((heapq.nlargest if order else heapq.nsmallest)(limit, row_ids, key=key))
+        else:
+            self.set_row_ids(sorted(row_ids, key=key, reverse=order))
+
+    def create_table(self, start=0, end=None, fields=None):
         """
-        Создает таблицу для вывода данных
+        Создает таблицу для вывода данных. Форматируются только строки и столбцы, которые будут выведены
+
+        Args:
+            start (int): Номер первой выводимой строки
+            end (int): Номер строки, перед которой вывод заканчивается, None если выводятся все строки до конца
+            fields (list): Список с нужными столбцами для вывода, None если выводятся все столбцы
 
         Returns
             PrettyTable: Таблица с данными
         """
-        if len(self.vacancies_objects) == 0:
+        if not self.has_vacancies():
             print('Нет данных')
             sys.exit()
 
         table = PrettyTable()
-        columns = ['№'] + list(DataSet.formatter(self.vacancies_objects[0]).keys())
-        table.field_names = columns
+        table.field_names = DataSet.get_columns(fields)
 
-        for index, vacancy in enumerate(self.vacancies_objects):
-            formatted_vacancy = DataSet.formatter(vacancy)
-            table.add_row([str(index + 1)] + list(DataSet.format_value(v) for v in formatted_vacancy.values()))
+        for index, formatted_vacancy in self.iter_formatted(start, end, fields):
+            table.add_row([str(index)] + list(formatted_vacancy.values()))
 
         table.max_width = 20
         table.align = 'l'
@@ -379,12 +835,105 @@ class DataSet:
         return table
 
     @staticmethod
-    def formatter(row):
+    def get_columns(fields=None):
+        """
+        Возвращает названия выводимых столбцов в порядке format_table
+
+        Args:
+            fields (list): Список с нужными столбцами, None если нужны все столбцы
+
+        Returns
+            list: Названия столбцов, первым идет номер строки
+
+        >>> DataSet.get_columns(['Оклад', 'Название'])
+        ['№', 'Название', 'Оклад']
+        """
+        return ['№'] + [k for k in DataSet.format_table.keys() if fields is None or k in fields]
+
+    def iter_formatted(self, start=0, end=None, fields=None):
+        """
+        Лениво форматирует выбранные вакансии из заданного диапазона
+
+        Args:
+            start (int): Номер первой строки
+            end (int): Номер строки, перед которой диапазон заканчивается, None если до конца
+            fields (list): Список с нужными столбцами, None если нужны все столбцы
+
+        Returns
+            generator: Пары из номера строки и форматированной вакансии
+        """
+        for index, vacancy in enumerate(islice(self.vacancies_objects, start, end), start + 1):
+            yield index, DataSet.formatter(vacancy, fields)
+
+    def export(self, file_name, start=0, end=None, fields=None):
+        """
+        Построчно записывает выбранные вакансии в файл csv, jsonl или xlsx, не собирая таблицу в памяти
+
+        Args:
+            file_name (str): Название файла, формат определяется по расширению
+            start (int): Номер первой строки
+            end (int): Номер строки, перед которой диапазон заканчивается, None если до конца
+            fields (list): Список с нужными столбцами, None если нужны все столбцы
+        """
+        columns = DataSet.get_columns(fields)
+        rows = ([str(index)] + list(formatted_vacancy.values())
+                for index, formatted_vacancy in self.iter_formatted(start, end, fields))
+        DataSet.export_table[os.path.splitext(file_name)[1]](file_name, columns, rows)
+
+    @staticmethod
+    def export_csv(file_name, columns, rows):
+        """
+        Записывает строки в csv файл
+
+        Args:
+            file_name (str): Название файла
+            columns (list): Названия столбцов
+            rows (iterable<list>): Строки таблицы
+        """
+        with open(file_name, 'w', encoding='utf-8-sig', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+    @staticmethod
+    def export_jsonl(file_name, columns, rows):
+        """
+        Записывает строки в файл json lines, по одному объекту на строку
+
+        Args:
+            file_name (str): Название файла
+            columns (list): Названия столбцов
+            rows (iterable<list>): Строки таблицы
+        """
+        with open(file_name, 'w', encoding='utf-8') as file:
+            for row in rows:
+                file.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n')
+
+    @staticmethod
+    def export_xlsx(file_name, columns, rows):
+        """
+        Записывает строки в xlsx файл через книгу openpyxl в режиме только для записи
+
+        Args:
+            file_name (str): Название файла
+            columns (list): Названия столбцов
+            rows (iterable<list>): Строки таблицы
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Вакансии')
+        ws.append(columns)
+        for row in rows:
+            ws.append(row)
+        wb.save(file_name)
+
+    @staticmethod
+    def formatter(row, fields=None):
         """
         Форматирует данные вакансии
 
         Args:
             row (Vacancy): Вакансия для форматирования
+            fields (list): Список с нужными столбцами, None если нужны все столбцы
 
         Returns
             dict: Форматированная вакансия
@@ -392,23 +941,30 @@ class DataSet:
         >>> DataSet.formatter(Vacancy('Программист', 'Хорошая вакансия', ['Знание алгоритмов', 'Работа с Git'], 'noExperience', 'Да', 'Контур', Salary('10000', '15000', 'False', 'RUR'),'Челябинск', '2022-07-13T11:03:58+0300'))
         {'Название': 'Программист', 'Описание': 'Хорошая вакансия', 'Навыки': 'Знание алгоритмов\\nРабота с Git', 'Опыт работы': 'Нет опыта', 'Премиум-вакансия': 'Да', 'Компания': 'Контур', 'Оклад': '10 000 - 15 000 (Рубли) (С вычетом налогов)', 'Название региона': 'Челябинск', 'Дата публикации вакансии': '13.07.2022'}
         """
-        return {k: DataSet.format_value(v(row)) for k, v in DataSet.format_table.items()}
+        return {k: (DataSet.format_repeated_value if k in DataSet.repeated_fields else DataSet.format_value)(v(row))
+                for k, v in DataSet.format_table.items() if fields is None or k in fields}
 
     @staticmethod
-    def print_table(table, vacancy_numbers, fields):
+    def parse_numbers(vacancy_numbers):
         """
-        Выводит таблицу в консоль
+        Переводит диапазон вывода в номера первой и последней строки
 
         Args:
-            table (PrettyTable): Таблица с данными
-            vacancy_numbers (list): Список с диапазоном строк для вывода
-            fields (list): Список с нужными столбцами для вывода
+            vacancy_numbers (str): Диапазон строк для вывода через пробел
+
+        Returns
+            (int, int): Номер первой строки и номер строки, перед которой вывод заканчивается,
+            None если диапазон не ограничен
+
+        >>> DataSet.parse_numbers('10 20')
+        (9, 19)
+        >>> DataSet.parse_numbers('')
+        (0, None)
         """
-        vacancy_numbers = vacancy_numbers.split() if vacancy_numbers != '' else []
-        fields = ['№'] + fields.split(', ') if fields != '' else table.field_names
+        vacancy_numbers = vacancy_numbers.split()
         start = int(vacancy_numbers[0]) - 1 if len(vacancy_numbers) >= 1 else 0
-        end = int(vacancy_numbers[1]) - 1 if len(vacancy_numbers) == 2 else len(table.rows)
-        print(table.get_string(start=start, end=end, fields=fields))
+        end = int(vacancy_numbers[1]) - 1 if len(vacancy_numbers) == 2 else None
+        return start, end
 
     @staticmethod
     def format_value(value):
@@ -430,10 +986,24 @@ class DataSet:
         >>> DataSet.format_value('ЕвроХим - один из крупнейших и наиболее быстро развивающихся производителей минеральных удобрений в мире. Наша цель – войти в пятерку лидеров отрасли.')
         'ЕвроХим - один из крупнейших и наиболее быстро развивающихся производителей минеральных удобрений в ...'
         """
-        for d in [DataSet.bools, DataSet.experience, Salary.currency]:
-            value = d[value] if value in d else value
+        value = DataSet.translations.get(value, value)
         return value if len(value) <= 100 else value[:100] + '...'
 
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def format_repeated_value(value):
+        """
+        Форматирует значение поля из repeated_fields, результаты кэшируются. Уникальные для вакансии значения,
+        такие как описание, через кэш не проходят, чтобы не держать их в памяти после вывода
+
+        Args:
+            value (str): Значение для форматирования
+
+        Returns:
+            str: Форматированное значение
+        """
+        return DataSet.format_value(value)
+
     def print_final_table(self, inputs):
         """
         Выводит готовую таблицу
@@ -441,11 +1011,16 @@ class DataSet:
         Args:
             inputs (Interface): Данные с вводом пользователя
         """
+        start, end = DataSet.parse_numbers(inputs.numbers)
+        fields = inputs.cols.split(', ') if inputs.cols != '' else None
         self.filter_vacancies(inputs.filter_parameter)
         self.sort_vacancies(inputs.sorting_parameter,
-                            inputs.sorting_order)
-        vacancy_table = self.create_table()
-        DataSet.print_table(vacancy_table, inputs.numbers, inputs.cols)
+                            inputs.sorting_order,
+                            end)
+        if inputs.export_file_name != '':
+            self.export(inputs.export_file_name, start, end, fields)
+        else:
+            print(self.create_table(start, end, fields))
 
 
 class Interface:
@@ -459,6 +1034,7 @@ class Interface:
         sorting_order (str):
         numbers (str):
         cols (str):
+        export_file_name (str): Название файла для экспорта, пустая строка для вывода в консоль
     """
     def __init__(self):
         """
@@ -471,6 +1047,7 @@ class Interface:
         self.sorting_order = inputs[3]
         self.numbers = inputs[4]
         self.cols = inputs[5]
+        self.export_file_name = inputs[6]
 
     @staticmethod
     def check_inputs():
@@ -487,26 +1064,179 @@ class Interface:
         sorting_order = input('Обратный порядок сортировки (Да / Нет): ')
         numbers = input('Введите диапазон вывода: ')
         cols = input('Введите требуемые столбцы: ')
+        export_file_name = input('Введите название файла для экспорта (csv, jsonl, xlsx): ')
 
-        if filter_parameter != '' and ':' not in filter_parameter:
-            print('Формат ввода некорректен')
-            sys.exit()
-        if filter_parameter != '' and filter_parameter.split(': ')[0] not in DataSet.filter_table.keys():
-            print('Параметр поиска некорректен')
-            sys.exit()
-        if sorting_parameter != '' and sorting_parameter not in DataSet.sort_table.keys():
-            print('Параметр сортировки некорректен')
+        error = Interface.get_error(filter_parameter, sorting_parameter, sorting_order, export_file_name)
+        if error is not None:
+            print(error)
             sys.exit()
+        return file_name, filter_parameter, sorting_parameter, sorting_order, numbers, cols, export_file_name
+
+    @staticmethod
+    def get_error(filter_parameter, sorting_parameter, sorting_order, export_file_name):
+        """
+        Находит ошибку во вводе пользователя
+
+        Args:
+            filter_parameter (str): Параметр фильтрации
+            sorting_parameter (str): Параметр сортировки
+            sorting_order (str): Порядок сортировки
+            export_file_name (str): Название файла для экспорта
+
+        Returns:
+            str: Сообщение об ошибке, None если ввод корректен
+
+        >>> Interface.get_error('Компания: Контур & Оклад: 1000', 'Оклад, Название', 'Да', '')
+        >>> Interface.get_error('', 'Зарплата', '', '')
+        'Параметр сортировки некорректен'
+        """
+        conditions = [condition for clause in DataSet.split_filter(filter_parameter) for condition in clause]
+        if filter_parameter != '' and any(':' not in condition for condition in conditions):
+            return 'Формат ввода некорректен'
+        if filter_parameter != '' and any(condition.split(': ')[0] not in DataSet.filter_table.keys()
+                                          for condition in conditions):
+            return 'Параметр поиска некорректен'
+        if sorting_parameter != '' and any(p not in DataSet.sort_table.keys() for p in sorting_parameter.split(', ')):
+            return 'Параметр сортировки некорректен'
         if sorting_order != '' and sorting_order != 'Да' and sorting_order != 'Нет':
-            print('Порядок сортировки задан некорректно')
-            sys.exit()
-        return file_name, filter_parameter, sorting_parameter, sorting_order, numbers, cols
+            return 'Порядок сортировки задан некорректно'
+        if export_file_name != '' and os.path.splitext(export_file_name)[1] not in DataSet.export_table.keys():
+            return 'Формат файла для экспорта некорректен'
+        return None
 
 
-def get_table():
+class Session:
     """
-    Выводит таблицу в консоль
+    Класс для интерактивной сессии: вакансии загружаются и индексируются один раз, затем выполняются команды
+    пользователя, каждая команда меняет один параметр запроса и выводит результат с временем выполнения
+
+    Attributes:
+        file_name (str): Название файла
+        dataset (DataSet): Загруженные вакансии с индексами
+        filter_parameter (str): Параметр фильтрации
+        sorting_parameter (str): Параметр сортировки
+        sorting_order (str): Порядок сортировки
+        numbers (str): Диапазон вывода
+        cols (str): Требуемые столбцы
+        export_file_name (str): Название файла для экспорта, пустая строка для вывода в консоль
+    """
+    commands = {
+        'фильтр': 'filter_parameter',
+        'сортировка': 'sorting_parameter',
+        'порядок': 'sorting_order',
+        'диапазон': 'numbers',
+        'столбцы': 'cols',
+        'экспорт': 'export_file_name',
+    }
+
+    def __init__(self, file_name):
+        """
+        Инициализирует объект Session, загружает вакансии из файла
+
+        Args:
+            file_name (str): Название файла
+        """
+        start = time.perf_counter()
+        self.file_name = file_name
+        self.dataset = DataSet(file_name)
+        self.filter_parameter = ''
+        self.sorting_parameter = ''
+        self.sorting_order = ''
+        self.numbers = ''
+        self.cols = ''
+        self.export_file_name = ''
+        print(f'Загружено вакансий: {len(self.dataset.all_vacancies)} за {time.perf_counter() - start:.3f} с')
+
+    def execute(self, command):
+        """
+        Выполняет команду вида 'команда значение'. Команда 'вывод' выполняет запрос без изменений.
+        При некорректном значении, в том числе нечисловом диапазоне или окладе, сохраняется предыдущее значение
+
+        Args:
+            command (str): Команда пользователя
+
+        Returns:
+            float: Время выполнения запроса в секундах, None если команда некорректна
+        """
+        name, _, value = command.strip().partition(' ')
+        if name == 'вывод':
+            return self.query()
+        if name not in Session.commands:
+            print('Неизвестная команда')
+            return None
+        attribute = Session.commands[name]
+        previous = getattr(self, attribute)
+        setattr(self, attribute, value)
+        error = Interface.get_error(self.filter_parameter, self.sorting_parameter, self.sorting_order,
+                                    self.export_file_name)
+        if error is None:
+            try:
+                return self.query()
+            except ValueError:
+                error = 'Формат ввода некорректен'
+        print(error)
+        setattr(self, attribute, previous)
+        return None
+
+    def query(self):
+        """
+        Выполняет запрос с текущими параметрами по уже загруженным вакансиям и выводит время выполнения
+
+        Returns:
+            float: Время выполнения запроса в секундах
+        """
+        start = time.perf_counter()
+        self.dataset.reset_selection()
+        try:
+            self.dataset.print_final_table(self)
+        except SystemExit:
+            pass
+        elapsed = time.perf_counter() - start
+        print(f'Время выполнения запроса: {elapsed * 1000:.1f} мс')
+        return elapsed
+
+    def run(self, commands=None):
+        """
+        Выполняет команды, пока они не закончатся или не будет введена команда 'выход'
+
+        Args:
+            commands (iterable<str>): Команды, None для чтения команд из консоли
+        """
+        for command in Session.read_commands() if commands is None else commands:
+            if command.strip() == 'выход':
+                break
+            self.execute(command)
+
+    @staticmethod
+    def read_commands():
+        """
+        Считывает команды из консоли
+
+        Returns:
+            generator: Генератор команд
+        """
+        print('Команды: ' + ', '.join(Session.commands) + ', вывод, выход')
+        while True:
+            try:
+                yield input('Введите команду: ')
+            except EOFError:
+                return
+
+
+def get_table(streaming=False):
+    """
+    Выводит таблицу в консоль или записывает ее в файл
+
+    Args:
+        streaming (bool): Обрабатывать ли вакансии потоково с внешней сортировкой, не загружая файл в память
     """
     inputs = Interface()
-    dataset = DataSet(inputs.file_name)
-    dataset.print_final_table(inputs)
\ No newline at end of file
+    dataset = DataSet(inputs.file_name, streaming)
+    dataset.print_final_table(inputs)
+
+
+def get_session():
+    """
+    Запускает интерактивную сессию запросов к вакансиям
+    """
+    Session('vacancies_big.csv').run()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import pickle
+from array import array
+from collections import deque
+from heapq import merge
+
+
+class AhoCorasick:
+    """
+    Класс для одновременного поиска нескольких подстрок в тексте алгоритмом Ахо-Корасик
+
+    Attributes:
+        patterns (list): Искомые подстроки
+        goto (list<dict>): Переходы бора по символам
+        fail (list<int>): Суффиксные ссылки узлов бора
+        output (list<frozenset>): Номера подстрок, которые заканчиваются в узле
+    """
+
+    def __init__(self, patterns):
+        """
+        Инициализирует объект AhoCorasick, строит бор и суффиксные ссылки
+
+        Args:
+            patterns (iterable<str>): Искомые подстроки
+        """
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        output = [set()]
+        for index, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto[node][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    output.append(set())
+                node = self.goto[node][char]
+            output[node].add(index)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0)
+                output[child] |= output[self.fail[child]]
+        self.output = [frozenset(indexes) for indexes in output]
+
+    def find(self, text):
+        """
+        Находит все подстроки, которые встречаются в тексте
+
+        Args:
+            text (str): Текст для поиска
+
+        Returns
+            frozenset: Номера найденных подстрок
+
+        >>> sorted(AhoCorasick(['Программист', 'Java', 'ист']).find('Java программист'))
+        [1, 2]
+        """
+        goto = self.goto
+        fail = self.fail
+        found = self.output[0]
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if self.output[node]:
+                found = found | self.output[node]
+        return found
+
+
+class TrigramIndex:
+    """
+    Класс для индекса строк по триграммам, который находит строки, содержащие подстроку
+
+    Attributes:
+        values (list): Уникальные строки
+        rows (list<array>): Номера строк исходного списка для каждой уникальной строки
+        postings (dict): Словарь, где каждой триграмме соответствует список номеров уникальных строк
+    """
+
+    def __init__(self, values):
+        """
+        Инициализирует объект TrigramIndex, строит индекс по списку строк
+
+        Args:
+            values (iterable<str>): Строки, например названия вакансий
+        """
+        self.values = []
+        self.rows = []
+        codes = {}
+        for row, value in enumerate(values):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values)
+                self.values.append(value)
+                self.rows.append(array('I'))
+            self.rows[code].append(row)
+
+        self.postings = {}
+        for code, value in enumerate(self.values):
+            for trigram in TrigramIndex.get_trigrams(value):
+                self.postings.setdefault(trigram, array('I')).append(code)
+
+    @staticmethod
+    def get_trigrams(value):
+        """
+        Возвращает множество триграмм строки
+
+        Args:
+            value (str): Строка
+
+        Returns
+            set: Множество триграмм
+        """
+        return {value[i:i + 3] for i in range(len(value) - 2)}
+
+    def find_values(self, substring):
+        """
+        Находит уникальные строки, содержащие подстроку. Проверяются только строки из самого короткого
+        списка триграмм подстроки
+
+        Args:
+            substring (str): Подстрока для поиска
+
+        Returns
+            list: Номера подходящих уникальных строк по возрастанию
+        """
+        if len(substring) < 3:
+            candidates = range(len(self.values))
+        else:
+            postings = [self.postings.get(trigram) for trigram in TrigramIndex.get_trigrams(substring)]
+            if None in postings:
+                return []
+            candidates = min(postings, key=len)
+        return [code for code in candidates if substring in self.values[code]]
+
+    def find(self, substring):
+        """
+        Находит строки, содержащие подстроку
+
+        Args:
+            substring (str): Подстрока для поиска
+
+        Returns
+            list: Номера подходящих строк исходного списка по возрастанию
+
+        >>> TrigramIndex(['Программист', 'Аналитик', 'Java программист', 'Программист']).find('рограммист')
+        [0, 2, 3]
+        """
+        return list(merge(*(self.rows[code] for code in self.find_values(substring))))
+
+    def save(self, file_name):
+        """
+        Сохраняет индекс в файл
+
+        Args:
+            file_name (str): Название файла
+        """
+        with open(file_name, 'wb') as file:
+            pickle.dump(self, file)
+
+    @staticmethod
+    def load(file_name):
+        """
+        Загружает индекс из файла
+
+        Args:
+            file_name (str): Название файла
+
+        Returns
+            TrigramIndex: Индекс
+        """
+        with open(file_name, 'rb') as file:
+            return pickle.load(file)
@@ -1,5 +1,111 @@
+import contextlib
+import currencies
+import csv
+import io
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase
-from table import Salary, DataSet, Vacancy
+import pandas as pd
+import pdf
+import parallel_csv
+from aggregates import PartialStatistics
+from cleaning import clean_rows
+from text_search import TrigramIndex
+from table import Salary, DataSet, Vacancy, Session, Interface
+
+HEADINGS = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+            'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+ROWS = [
+    ['Программист', '<p>Хорошая вакансия</p>', 'Git\nPython', 'noExperience', 'True', 'Контур', '10000.0', '15000.0',
+     'False', 'RUR', 'Челябинск', '2022-07-13T11:03:58+0300'],
+    ['Аналитик', 'Описание', '', 'between1And3', 'False', 'СКБ', '20000.0', '30000.0', 'True', 'RUR',
+     'Москва', '2021-05-01T10:00:00+0300'],
+    ['Программист Java', 'Описание', 'Java\nGit', 'between3And6', 'False', 'СКБ', '1000.0', '2000.0', 'True', 'USD',
+     'Москва', '2021-06-01T10:00:00+0300'],
+]
+
+
+def write_csv(directory, rows=ROWS):
+    file_name = os.path.join(directory, 'vacancies.csv')
+    with open(file_name, 'w', encoding='utf_8_sig', newline='') as file_csv:
+        writer = csv.writer(file_csv)
+        writer.writerow(HEADINGS)
+        writer.writerows(rows)
+    return file_name
+
+
+def write_currency_csv(file_name):
+    # get_currency_dynamic отбрасывает валюты, у которых 5000 вакансий или меньше, поэтому каждая валюта
+    # повторяется 5001 раз: первый квартал 2003 года, RUR, USD и KZT
+    pd.DataFrame({'name': 'a', 'salary_from': 1, 'salary_to': 2, 'area_name': 'Москва',
+                  'salary_currency': ['RUR', 'USD', 'KZT'] * 5001,
+                  'published_at': ['2003-01-10T00:00:00+0300', '2003-02-10T00:00:00+0300',
+                                   '2003-03-10T00:00:00+0300'] * 5001}).to_csv(file_name, index=False)
+
+
+DAILY_XML = '''<?xml version="1.0" encoding="windows-1251"?>
+<ValCurs Date="{date}" name="Foreign Currency Market">
+<Valute ID="R01235"><NumCode>840</NumCode><CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США</Name>
+<Value>{usd}</Value></Valute>
+<Valute ID="R01335"><NumCode>398</NumCode><CharCode>KZT</CharCode><Nominal>100</Nominal><Name>Тенге</Name>
+<Value>{kzt}</Value></Valute>
+</ValCurs>'''
+
+DYNAMIC_XML = '''<?xml version="1.0" encoding="windows-1251"?>
+<ValCurs ID="{id}" DateRange1="01.01.2003" DateRange2="28.03.2003" name="Foreign Currency Market Dynamic">
+{records}</ValCurs>'''
+
+
+def dynamic_xml(currency_id, nominal, rates):
+    return DYNAMIC_XML.format(id=currency_id, records=''.join(
+        f'<Record Date="{date}" Id="{currency_id}"><Nominal>{nominal}</Nominal><Value>{value}</Value></Record>\n'
+        for date, value in rates))
+
+
+class CBRHandler(BaseHTTPRequestHandler):
+    responses = {}
+    requests = []
+    failures = 0
+
+    def do_GET(self):
+        CBRHandler.requests.append(self.path)
+        if CBRHandler.failures:
+            CBRHandler.failures -= 1
+            self.send_error(500)
+            return
+        body = CBRHandler.responses.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        body = body.encode('windows-1251')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def cbr_server(responses, failures=0):
+    CBRHandler.responses = responses
+    CBRHandler.requests = []
+    CBRHandler.failures = failures
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CBRHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}/scripts'
+    finally:
+        server.shutdown()
+        server.server_close()
+
 
 class SalaryTests(TestCase):
     def test_get_salary(self):
@@ -8,13 +114,314 @@ class SalaryTests(TestCase):
     def test_get_average_salary_rub(self):
         self.assertEqual(Salary('1010', '3500', 'True', 'EUR').get_average_salary_rub(), 135074.5)
 
+
 class DatasetTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.file_name = write_csv(self.directory)
+        self.dataset = DataSet(self.file_name)
+
     def test_process_vacancy(self):
         self.assertEqual(DataSet.process_vacancy('Основные функции:</strong></p> <ul> <li>мониторинг состояния промышленных кластеров СУБД'), 'Основные функции: мониторинг состояния промышленных кластеров СУБД')
 
+    def test_clean_rows(self):
+        rows = [['<p>Знание <b>Python</b></p>', 'Git\nSQL'], ['  RUR ', '10000.0'],
+                ['Требования: ответственность, трудолюбие <p> </p> ', 'Git\n\n  Python \n'],
+                ['Обязанности:</strong></p> <ul> <li>Работа;', '<a\nb> 1 < 2']]
+        expected = [[' '.join(('; '.join(re.sub(re.compile('<.*?>'), '', value).split('\n')).split())) for value in row]
+                    for row in rows]
+        self.assertEqual(expected[2], ['Требования: ответственность, трудолюбие', 'Git; ; Python ;'])
+        self.assertEqual(list(clean_rows(rows)), expected)
+        self.assertEqual(list(clean_rows(rows, processes=2, chunk_size=1)), expected)
+
     def test_formatter(self):
         self.assertEqual(DataSet.formatter(Vacancy('Программист', 'Хорошая вакансия', ['Знание алгоритмов', 'Работа с Git'], 'noExperience', 'Да', 'Контур', Salary('10000', '15000', 'False', 'RUR'),'Челябинск', '2022-07-13T11:03:58+0300')),
                          {'Название': 'Программист', 'Описание': 'Хорошая вакансия', 'Навыки': 'Знание алгоритмов\nРабота с Git', 'Опыт работы': 'Нет опыта', 'Премиум-вакансия': 'Да', 'Компания': 'Контур', 'Оклад': '10 000 - 15 000 (Рубли) (С вычетом налогов)', 'Название региона': 'Челябинск', 'Дата публикации вакансии': '13.07.2022'})
 
     def test_format_value(self):
         self.assertEqual(DataSet.format_value('ЕвроХим - один из крупнейших и наиболее быстро развивающихся производителей минеральных удобрений в мире. Наша цель – войти в пятерку лидеров отрасли.'), 'ЕвроХим - один из крупнейших и наиболее быстро развивающихся производителей минеральных удобрений в ...')
+
+    def test_format_cache(self):
+        DataSet.format_repeated_value('between1And3')
+        hits = DataSet.get_cache_stats()['format_repeated_value']['hits']
+        self.assertEqual(DataSet.format_repeated_value('between1And3'), 'От 1 года до 3 лет')
+        self.assertEqual(DataSet.get_cache_stats()['format_repeated_value']['hits'], hits + 1)
+        size = DataSet.format_repeated_value.cache_info().currsize
+        DataSet.formatter(Vacancy('Уникальное название', 'Уникальное описание', [], 'noExperience', 'False', 'Контур',
+                                  Salary('1', '2', 'False', 'RUR'), 'Москва', '2022-07-13T11:03:58+0300'),
+                          ['Название', 'Описание'])
+        self.assertEqual(DataSet.format_repeated_value.cache_info().currsize, size)
+
+    def test_iter_vacancies(self):
+        vacancies = DataSet.iter_vacancies(self.file_name)
+        self.assertNotIsInstance(vacancies, list)
+        self.assertEqual([vacancy.name for vacancy in vacancies], ['Программист', 'Программист Java'])
+
+    def test_filter_by_name(self):
+        self.dataset.filter_vacancies('Название: Программист')
+        self.assertEqual([vacancy.name for vacancy in self.dataset.vacancies_objects], ['Программист'])
+        self.assertEqual(TrigramIndex(['Программист', 'Java', 'Программист Java']).find('Java'), [1, 2])
+
+    def test_trigram_index_save(self):
+        index = TrigramIndex(['Программист', 'Java', 'Программист Java', 'Аналитик'])
+        file_name = os.path.join(self.directory, 'names.index')
+        index.save(file_name)
+        loaded = TrigramIndex.load(file_name)
+        for substring in ['Java', 'рограммист', 'Аналитик', 'Python']:
+            self.assertEqual(loaded.find(substring), index.find(substring))
+        self.assertEqual(loaded.find('Java'), [1, 2])
+
+    def test_filter_by_index(self):
+        self.assertEqual(self.dataset.indexes, {})
+        self.dataset.filter_vacancies('Опыт работы: От 3 до 6 лет')
+        self.assertEqual(self.dataset.row_ids, [1])
+        self.assertEqual(self.dataset.get_index('Опыт работы'), {'Нет опыта': [0], 'От 3 до 6 лет': [1]})
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(io.StringIO()):
+            self.dataset.filter_vacancies('Компания: Контур')
+
+    def test_filter_by_salary(self):
+        self.assertEqual(self.dataset.get_salary_index().stab(1500), [1])
+        self.dataset.filter_vacancies('Оклад: 1900 - 12000')
+        self.assertEqual(self.dataset.row_ids, [0, 1])
+
+    def test_filter_by_skills(self):
+        self.assertEqual(self.dataset.get_skills_by_year(), {2021: {'Java': 1, 'Git': 1}, 2022: {'Git': 1, 'Python': 1}})
+        self.dataset.filter_vacancies('Навыки: Git, Java')
+        self.assertEqual(self.dataset.row_ids, [1])
+
+    def test_composite_filter(self):
+        self.assertEqual(self.dataset.estimate_rows('Навыки', 'Git, Java'), 1)
+        self.assertEqual(self.dataset.estimate_rows('Оклад', '12000'), 2 * DataSet.field_selectivity['Оклад'])
+        self.assertEqual(self.dataset.indexes, {})
+        self.dataset.get_salary_index()
+        self.assertEqual(self.dataset.estimate_rows('Оклад', '12000'), 1)
+        self.dataset.filter_vacancies('Навыки: Git & Оклад: 1500 | Компания: Контур & Опыт работы: Нет опыта')
+        self.assertEqual(self.dataset.row_ids, [0, 1])
+        self.dataset.filter_vacancies('Навыки: Python & Компания: СКБ | Название региона: Москва')
+        self.assertEqual(self.dataset.row_ids, [1])
+
+    def test_planner_builds_one_index(self):
+        self.dataset.filter_vacancies('Опыт работы: От 3 до 6 лет & Компания: СКБ')
+        self.assertEqual(self.dataset.row_ids, [1])
+        self.assertEqual(list(self.dataset.indexes), ['Компания'])
+
+    def test_filter_with_separator_in_value(self):
+        self.assertEqual(DataSet.parse_filter('Компания: Procter & Gamble | Название: C++ & C# разработчик'),
+                         [[('Компания', 'Procter & Gamble')], [('Название', 'C++ & C# разработчик')]])
+        self.assertIsNone(Interface.get_error('Компания: Procter & Gamble & Опыт работы: Нет опыта', '', '', ''))
+
+    def test_sort_vacancies(self):
+        self.dataset.sort_vacancies('Навыки, Оклад', 'Да')
+        self.assertEqual(self.dataset.row_ids, [1, 0])
+        self.dataset.sort_vacancies('Оклад', 'Нет', 1)
+        self.assertEqual(self.dataset.row_ids, [0])
+        self.assertEqual(list(self.dataset.sort_keys), ['Навыки', 'Оклад'])
+
+    def test_streaming_sort(self):
+        dataset = DataSet(self.file_name, streaming=True, chunk_size=1)
+        dataset.filter_vacancies('Навыки: Git')
+        dataset.sort_vacancies('Оклад', 'Да')
+        self.assertEqual([vacancy.name for vacancy in dataset.vacancies_objects], ['Программист Java', 'Программист'])
+
+    def test_create_table_page(self):
+        table = self.dataset.create_table(1, 2, ['Компания', 'Название'])
+        self.assertEqual(table.field_names, ['№', 'Название', 'Компания'])
+        self.assertEqual(table.rows, [['2', 'Программист Java', 'СКБ']])
+
+    def test_export(self):
+        for extension in ['.csv', '.jsonl', '.xlsx']:
+            file_name = os.path.join(self.directory, 'export' + extension)
+            self.dataset.export(file_name, 1, None, ['Название', 'Компания'])
+            self.assertTrue(os.path.getsize(file_name) > 0)
+        with open(os.path.join(self.directory, 'export.csv'), encoding='utf-8-sig') as file:
+            self.assertEqual(list(csv.reader(file)), [['№', 'Название', 'Компания'], ['2', 'Программист Java', 'СКБ']])
+        with open(os.path.join(self.directory, 'export.jsonl'), encoding='utf-8') as file:
+            self.assertEqual(file.read(), '{"№": "2", "Название": "Программист Java", "Компания": "СКБ"}\n')
+
+    def test_session(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            session = Session(self.file_name)
+            session.run(['диапазон 1 2', 'сортировка Оклад', 'порядок Да', 'сортировка Зарплата', 'диапазон abc',
+                         'фильтр Оклад: abc', 'вывод', 'выход', 'фильтр Компания: Контур'])
+        self.assertEqual(session.sorting_parameter, 'Оклад')
+        self.assertEqual(session.filter_parameter, '')
+        self.assertEqual(session.numbers, '1 2')
+        self.assertIn('Параметр сортировки некорректен', output.getvalue())
+        self.assertEqual(output.getvalue().count('Формат ввода некорректен'), 2)
+        self.assertEqual(session.dataset.row_ids, [1])
+
+
+class StatisticsTests(TestCase):
+    def test_columnar_statistics(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = write_csv(directory, ROWS + [ROWS[0][:1] + ['Описание', 'Git'] + ROWS[0][3:]])
+            objects = pdf.Statistics(pdf.DataSet(file_name), 'Программист')
+            columns = pdf.Statistics(pdf.DataSet(file_name, columnar=True), 'Программист')
+        self.assertEqual(len(columns.dataset.vacancies_objects), 3)
+        self.assertEqual(columns.get_salary_level(), objects.get_salary_level())
+        self.assertEqual(columns.get_salary_level_by_city(), objects.get_salary_level_by_city())
+        self.assertEqual(columns.number_of_vacancies_by_profession, {2022: 2, 2021: 1})
+
+    def test_batch_statistics(self):
+        professions = ['Программист', 'Java', 'Аналитик']
+        with tempfile.TemporaryDirectory() as directory:
+            dataset = pdf.DataSet(write_csv(directory, ROWS + [ROWS[0][:1] + ['Описание', 'Git'] + ROWS[0][3:]]))
+        batch = pdf.Statistics.create_batch(dataset, professions)
+        for profession in professions:
+            self.assertEqual(batch[profession].get_results(), pdf.Statistics(dataset, profession).get_results())
+        self.assertEqual(batch['Java'].number_of_vacancies_by_profession, {2021: 1})
+
+    def test_column_projection(self):
+        vacancies = pdf.DataSet.csv_filter([ROWS[0]], HEADINGS, pdf.Vacancy.columns)
+        self.assertEqual(next(vacancies), {'name': 'Программист', 'salary_from': 10000.0, 'salary_to': 15000.0,
+                                           'salary_currency': 'RUR', 'area_name': 'Челябинск',
+                                           'published_at': '2022-07-13T11:03:58+0300'})
+
+    def test_parallel_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = write_csv(directory, ROWS * 5)
+            serial = pdf.DataSet.create_vacancies_columns(file_name)
+            columns = parallel_csv.load_columns(file_name, processes=2, chunks=4)
+            partial = parallel_csv.load_statistics(file_name, 'Программист', processes=2, chunks=4)
+        self.assertEqual(list(columns.name_ids), list(serial.name_ids))
+        self.assertEqual(columns.names, serial.names)
+        self.assertEqual(partial.finalize(), pdf.Statistics.collect_columns(serial, 'Программист').finalize())
+
+    def test_parse_once(self):
+        vacancy = pdf.Vacancy('Программист', 'Москва', pdf.Salary('1010', '3500', 'EUR'), '2022-07-13T11:03:58+0300')
+        self.assertEqual((vacancy.year, vacancy.salary.salary_from, vacancy.salary.average_salary_rub),
+                         (2022, 1010.0, 135074.5))
+
+    def test_results_are_memoized(self):
+        with tempfile.TemporaryDirectory() as directory:
+            statistics = pdf.Statistics(pdf.DataSet(write_csv(directory), streaming=True), 'Программист')
+        self.assertIs(statistics.get_salary_level_by_city(), statistics.get_results()[4])
+        self.assertEqual(statistics.get_results()[1], {2022: 1, 2021: 1})
+
+
+class PartialStatisticsTests(TestCase):
+    def test_merge(self):
+        rows = [(2021, 'Москва', 100.0, True), (2022, 'Москва', 200.0, False), (2022, 'Пермь', None, True),
+                (2021, 'Пермь', 300.5, False)]
+        whole = PartialStatistics('Программист')
+        parts = [PartialStatistics('Программист') for _ in rows]
+        for part, row in zip(parts, rows):
+            whole.add(*row)
+            part.add(*row)
+        left = (parts[0] + parts[1]) + (parts[2] + parts[3])
+        right = parts[0] + (parts[1] + (parts[2] + parts[3]))
+        restored = PartialStatistics.from_dict(left.to_dict())
+        self.assertEqual(left.finalize(), whole.finalize())
+        self.assertEqual(right.finalize(), whole.finalize())
+        self.assertEqual(restored.finalize(), whole.finalize())
+        self.assertEqual(whole.finalize()[:2], [{2021: 200, 2022: 200}, {2021: 2, 2022: 2}])
+
+
+class CurrenciesTests(TestCase):
+    def test_convert_to_rub(self):
+        df = pd.DataFrame({'salary': [100.0, 100.0, 100.0, 100.0, 100.0],
+                           'salary_currency': ['RUR', 'USD', 'EUR', None, 'USD'],
+                           'published_at': ['2003-01-10T00:00:00+0300', '2003-02-10T00:00:00+0300',
+                                            '2003-02-10T00:00:00+0300', '2003-01-10T00:00:00+0300',
+                                            '2010-01-10T00:00:00+0300']})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'currency_dynamic.csv')
+            with open(file_name, 'w') as file:
+                file.write('date,USD,EUR\n2003-01,30.0,\n2003-02,31.5,\n')
+            salaries = currencies.convert_to_rub(df, *currencies.get_rate_matrix(file_name))
+        self.assertEqual(salaries.fillna(-1).tolist(), [100.0, 3150.0, -1, -1, -1])
+
+    def test_convert_to_rub_sqlite(self):
+        df = pd.DataFrame({'salary': [100.0, 100.0, 100.0, None],
+                           'salary_currency': ['RUR', 'USD', 'EUR', 'USD'],
+                           'published_at': ['2003-01-10T00:00:00+0300', '2003-02-10T00:00:00+0300',
+                                            '2003-02-10T00:00:00+0300', '2003-01-10T00:00:00+0300']})
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE currency_dynamic (date text, USD float, EUR float)')
+        conn.executemany('INSERT INTO currency_dynamic VALUES (?, ?, ?)', [('2003-01', 30.0, 0), ('2003-02', 31.5, None)])
+        with contextlib.redirect_stdout(io.StringIO()):
+            salaries = currencies.convert_to_rub_sqlite(conn, df)
+        conn.close()
+        self.assertEqual(salaries.fillna(-1).tolist(), [100.0, 3150.0, -1, -1])
+
+    def test_get_currency_dynamic_csv(self):
+        daily = '/scripts/XML_daily.asp?date_req='
+        responses = {daily + '28/01/2003': DAILY_XML.format(date='28.01.2003', usd='31,8', kzt='20,5'),
+                     daily + '28/02/2003': DAILY_XML.format(date='28.02.2003', usd='31,6', kzt='20,4'),
+                     daily + '28/03/2003': '<ValCurs Date="28.03.2003"></ValCurs>'}
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            dynamic_file_name = os.path.join(directory, 'currency_dynamic.csv')
+            cache_dir = os.path.join(directory, 'cache')
+            write_currency_csv(file_name)
+            with cbr_server(responses, failures=1) as base_url, contextlib.redirect_stdout(io.StringIO()):
+                currencies.get_currency_dynamic_csv(file_name, dynamic_file_name, base_url, cache_dir, max_workers=2,
+                                                    backoff=0)
+                self.assertEqual(len(CBRHandler.requests), 4)
+                dynamic = pd.read_csv(dynamic_file_name)
+                CBRHandler.requests = []
+                currencies.get_currency_dynamic_csv(file_name, dynamic_file_name, base_url, cache_dir)
+                self.assertEqual(CBRHandler.requests, [])
+        self.assertEqual(dynamic.columns.tolist(), ['date', 'USD', 'KZT'])
+        self.assertEqual(dynamic.values.tolist(), [['2003-01', 31.8, 0.205], ['2003-02', 31.6, 0.204]])
+
+    def test_get_currency_dynamic_csv_by_range(self):
+        dynamic = '/scripts/XML_dynamic.asp?date_req1=01/01/2003&date_req2=28/03/2003&VAL_NM_RQ='
+        responses = {
+            dynamic + 'R01235': dynamic_xml('R01235', 1, [('25.01.2003', '31,7'), ('28.01.2003', '31,8'),
+                                                          ('29.01.2003', '31,9'), ('27.02.2003', '31,6')]),
+            dynamic + 'R01335': dynamic_xml('R01335', 100, [('28.01.2003', '20,5'), ('01.02.2003', '20,4')])}
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            dynamic_file_name = os.path.join(directory, 'currency_dynamic.csv')
+            write_currency_csv(file_name)
+            with cbr_server(responses) as base_url, contextlib.redirect_stdout(io.StringIO()):
+                currencies.get_currency_dynamic_csv(file_name, dynamic_file_name, base_url, method='dynamic')
+                self.assertEqual(len(CBRHandler.requests), 2)
+            dynamic = pd.read_csv(dynamic_file_name)
+        self.assertEqual(dynamic.columns.tolist(), ['date', 'USD', 'KZT'])
+        self.assertEqual(dynamic.fillna(-1).values.tolist(), [['2003-01', 31.8, 0.205], ['2003-02', 31.6, 0.204]])
+
+    def test_update_currency_dynamic_sqlite(self):
+        daily = '/scripts/XML_daily.asp?date_req='
+        responses = {daily + '28/02/2003': DAILY_XML.format(date='28.02.2003', usd='31,6', kzt='20,4'),
+                     daily + '28/03/2003': '<ValCurs Date="28.03.2003"></ValCurs>'}
+        df = pd.DataFrame({'salary_currency': ['USD', 'RUR', None],
+                           'published_at': ['2003-01-10T00:00:00+0300', '2003-02-10T00:00:00+0300',
+                                            '2003-03-10T00:00:00+0300']})
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE currency_dynamic (date text, USD float, EUR float)')
+        conn.execute("INSERT INTO currency_dynamic VALUES ('2003-01', 30.0, 35.0)")
+        with cbr_server(responses) as base_url, contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(currencies.update_currency_dynamic_sqlite(conn, df, base_url, cache_dir=None), 2)
+            self.assertEqual(len(CBRHandler.requests), 2)
+            CBRHandler.requests = []
+            changes = conn.total_changes
+            self.assertEqual(currencies.update_currency_dynamic_sqlite(conn, df, base_url, cache_dir=None), 0)
+            self.assertEqual(CBRHandler.requests, [])
+            self.assertEqual(conn.total_changes, changes)
+        self.assertEqual(conn.execute('SELECT * FROM currency_dynamic ORDER BY date').fetchall(),
+                         [('2003-01', 30.0, 35.0), ('2003-02', 31.6, None), ('2003-03', None, None)])
+        conn.close()
+
+    def test_update_currency_dynamic_sqlite_other_currency(self):
+        daily = '/scripts/XML_daily.asp?date_req='
+        responses = {daily + '28/02/2003': DAILY_XML.format(date='28.02.2003', usd='31,6', kzt='20,4')}
+        published_at = ['2003-02-10T00:00:00+0300']
+        df = pd.DataFrame({'salary': [100.0], 'salary_currency': ['KZT'], 'published_at': published_at})
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE currency_dynamic (date text, USD float, KZT float)')
+        with cbr_server(responses) as base_url, contextlib.redirect_stdout(io.StringIO()):
+            currencies.update_currency_dynamic_sqlite(conn, pd.DataFrame({'salary_currency': ['USD'],
+                                                                          'published_at': published_at}),
+                                                      base_url, cache_dir=None)
+            self.assertEqual(currencies.update_currency_dynamic_sqlite(conn, df, base_url, cache_dir=None), 0)
+            conn.execute("UPDATE currency_dynamic SET KZT = NULL")
+            conn.execute("DELETE FROM currency_dynamic_fetched WHERE currency = 'KZT'")
+            self.assertEqual(currencies.update_currency_dynamic_sqlite(conn, df, base_url, cache_dir=None), 1)
+            self.assertEqual(len(CBRHandler.requests), 2)
+        self.assertEqual(conn.execute('SELECT * FROM currency_dynamic').fetchall(), [('2003-02', 31.6, 0.204)])
+        self.assertAlmostEqual(currencies.convert_to_rub(df, *currencies.get_rate_matrix_sqlite(conn))[0], 20.4)
+        conn.close()